@@ -1,15 +1,25 @@
 import os
 import time
 import json
+import shutil
+import hashlib
+import struct
+import uuid
 import logging
 import threading
+from collections import defaultdict
+from contextlib import ExitStack, suppress
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from types import MappingProxyType
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 
 from flask import Flask, request, jsonify, send_from_directory
 from flask_socketio import SocketIO, emit, join_room, leave_room
 from flask_cors import CORS
+from werkzeug.utils import secure_filename
 
 from core.task_manager import TaskManager, TaskStatus
 from core.audio_processor import AudioProcessor
@@ -19,21 +29,48 @@ from core.subtitle_generator import SubtitleGenerator
 from core.translation_client import TranslationClient
 from core.tts_client import TTSClient
 from core.video_synthesizer import VideoSynthesizer
+from core.tts_cache import TTSCache
 from utils.logger import setup_logger, get_logger
 from utils.config import get_config
+from utils.fast_json import OrjsonProvider, OrjsonAdapter
 
 # 初始化日志
 setup_logger()
 logger = get_logger("app")
 
+# 尝试导入 flask-compress，如果失败则不压缩响应
+try:
+    from flask_compress import Compress
+
+    FLASK_COMPRESS_AVAILABLE = True
+except ImportError:
+    FLASK_COMPRESS_AVAILABLE = False
+    logger.warning("flask-compress 不可用，HTTP 响应将不压缩")
+
 # 获取配置
 config = get_config()
 
 # 初始化 Flask 和 SocketIO
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.config["SECRET_KEY"] = os.getenv("SECRET_KEY", "video-subtitle-secret")
+# 上传大小上限 8GB；普通表单字段只允许少量内存
+app.config["MAX_CONTENT_LENGTH"] = 8 * 1024**3
+app.config["MAX_FORM_MEMORY_SIZE"] = 64 * 1024
+# 压缩大于 1KB 的 JSON 响应（任务列表包含完整字幕时体积很大）
+app.config["COMPRESS_MIN_SIZE"] = 1024
+app.config["COMPRESS_MIMETYPES"] = ["application/json"]
 CORS(app)
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode="threading")
+if FLASK_COMPRESS_AVAILABLE:
+    Compress(app)
+socketio = SocketIO(
+    app,
+    cors_allowed_origins="*",
+    # 作业阶段（VAD、NumPy 计算、SQLite、字幕生成等）会长时间占用 CPU 或阻塞，
+    # 使用原生线程运行，避免在 eventlet 单线程事件循环中卡住 Socket.IO 与进度推送
+    async_mode="threading",
+    json=OrjsonAdapter(),
+)
 
 # 初始化核心组件
 task_manager = TaskManager()
@@ -46,9 +83,109 @@ subtitle_generator = SubtitleGenerator()
 translation_client = TranslationClient()
 tts_client = TTSClient()
 video_synthesizer = VideoSynthesizer()
+tts_cache = TTSCache()
+
+# 后台作业线程池按 max_concurrent_tasks 的设置上限创建，实际并发由作业槽位控制：
+# 同时运行的重任务数不超过 max_concurrent_tasks，其余等待槽位
+JOB_MAX_WORKERS = 20
+job_executor = ThreadPoolExecutor(max_workers=JOB_MAX_WORKERS, thread_name_prefix="videojob")
+_job_limit = config.max_concurrent_tasks
+_job_active = 0
+_job_slots = threading.Condition()
+
+# 上传文件写盘缓冲大小
+UPLOAD_BUFFER_SIZE = 1 << 20
+# 上传目录，在 init_app 中创建，temp_dir 变更时刷新
+_UPLOAD_DIR = Path(config.temp_dir) / "uploads"
+
+# 预览图清理单线程池，清理工作不占用配音任务的关键路径
+_preview_cleanup_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="preview-cleanup")
+
+# 已验证可写的自定义导出目录缓存 (export_path, 目录)，配置变更时失效
+_export_dir_cache: Optional[Tuple[str, Path]] = None
+_export_dir_lock = threading.Lock()
+
+# 二进制进度帧: 任务 UUID(16B) + 进度(float32) + 状态码(u8) + 状态文本码(u8)
+# 状态与文本码表需与前端 services/websocket.ts 保持一致，只能在末尾追加
+PROGRESS_FRAME_FORMAT = "<16sfBB"
+PROGRESS_STATUS_CODES = {
+    status: code
+    for code, status in enumerate(
+        ("pending", "processing", "paused", "completed", "failed", "cancelled")
+    )
+}
+PROGRESS_TEXT_CODES = {
+    text: code
+    for code, text in enumerate(
+        (
+            "正在提取音频...",
+            "正在检测语音段落...",
+            "正在识别语音...",
+            "正在生成字幕...",
+            "正在翻译字幕...",
+            "正在合成配音...",
+            "正在合成视频...",
+            "处理完成",
+            "翻译完成",
+            "配音合成完成",
+            "等待处理",
+            "等待重试",
+            "等待配音",
+        )
+    )
+}
+
+# 任务序列化缓存：按任务状态指纹复用 to_dict 结果，
+# 任何途径修改了参与指纹的字段（包括直接赋值 task.subtitles 等）都会使缓存失效
+_TASK_STATE_FIELDS = (
+    "status",
+    "progress",
+    "status_text",
+    "error",
+    "audio_path",
+    "output_video_path",
+)
+_task_dict_cache: Dict[str, Tuple[tuple, dict]] = {}
 
-# 任务房间映射 (task_id -> sid)
+# 任务房间映射 (task_id -> sid)，以及反向索引 (sid -> task_ids) 用于断开时快速清理
 task_rooms: Dict[str, str] = {}
+sid_to_tasks: Dict[str, set] = defaultdict(set)
+# task_id -> 订阅该任务的全部 sid，仅一个订阅者时进度直接发给该 sid
+task_subscribers: Dict[str, set] = defaultdict(set)
+_rooms_lock = threading.Lock()
+
+# 源文件内容缓存：按内容哈希复用音频提取 / VAD / ASR 结果
+CONTENT_CACHE_MAX_BYTES = 5 * 1024**3
+VAD_CACHE_SETTINGS = (
+    "vad_sensitivity",
+    "vad_threshold",
+    "min_speech_duration",
+    "min_silence_duration",
+    "max_speech_duration",
+    "vad_min_volume_db",
+    "vad_enable_volume_filter",
+)
+# 所有会改变识别结果的配置项
+ASR_CACHE_SETTINGS = (
+    "api_model",
+    "asr_language",
+    "language_guard",
+    "context_retry",
+    "context_retry_padding",
+    "auto_remove_drift",
+)
+# (路径, 修改时间, 大小) -> sha256
+_content_hash_cache: Dict[Tuple[str, int, int], str] = {}
+
+# 进度推送节流：每个任务最多约 10 次/秒，被合并掉的中间帧由尾帧补发
+PROGRESS_EMIT_INTERVAL = 0.1
+_progress_lock = threading.Lock()
+# task_id -> (上次推送时间, 上次推送进度, 上次状态文本)
+_progress_state: Dict[str, Tuple[float, float, str]] = {}
+# task_id -> 等待补发的最新进度
+_pending_progress: Dict[str, dict] = {}
+# 进入这些状态后不会再有后续进度，节流状态随之清除
+_TERMINAL_STATUSES = frozenset(("completed", "failed", "cancelled"))
 
 
 def init_app():
@@ -58,29 +195,383 @@ def init_app():
     # 确保必要目录存在
     Path(config.temp_dir).mkdir(parents=True, exist_ok=True)
     Path(config.output_dir).mkdir(parents=True, exist_ok=True)
+    _refresh_upload_dir()
 
     # 注册进度回调
     task_manager.set_progress_callback(on_task_progress)
 
+    # 限制内容缓存大小
+    _trim_content_cache()
+
     logger.info("应用初始化完成")
 
 
+def _refresh_upload_dir():
+    """根据当前 temp_dir 重新定位并创建上传目录"""
+    global _UPLOAD_DIR
+    _UPLOAD_DIR = Path(config.temp_dir) / "uploads"
+    _UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+
+
 def on_task_progress(task_id: str, progress: float, status_text: str, data: Any = None):
-    """任务进度回调"""
-    # 发送进度更新到对应房间
-    socketio.emit(
-        "task_progress",
-        {
-            "taskId": task_id,
-            "progress": progress,
-            "statusText": status_text,
-            "status": TaskStatus.PROCESSING.value,
-            "data": data,
-        },
-        room=task_id,
+    """任务进度回调（合并高频进度，最终帧不会丢失）"""
+    payload = {
+        "taskId": task_id,
+        "progress": progress,
+        "statusText": status_text,
+        "status": TaskStatus.PROCESSING.value,
+        "data": data,
+    }
+    now = time.monotonic()
+    flush_delay = None
+    task = task_manager.get_task(task_id)
+    terminal = (
+        progress >= 100
+        or task is None
+        or getattr(task.status, "value", task.status) in _TERMINAL_STATUSES
+    )
+
+    with _progress_lock:
+        last = _progress_state.get(task_id)
+        should_emit = (
+            last is None
+            or data is not None
+            or terminal
+            or now - last[0] > PROGRESS_EMIT_INTERVAL
+            or abs(progress - last[1]) >= 1.0
+            or status_text != last[2]
+        )
+
+        if should_emit:
+            _pending_progress.pop(task_id, None)
+            if terminal:
+                _progress_state.pop(task_id, None)
+            else:
+                _progress_state[task_id] = (now, progress, status_text)
+        else:
+            # 已有补发任务时只替换待发内容
+            if task_id not in _pending_progress:
+                flush_delay = max(0.0, PROGRESS_EMIT_INTERVAL - (now - last[0]))
+            _pending_progress[task_id] = payload
+
+    if should_emit:
+        _emit_progress(task_id, payload)
+    elif flush_delay is not None:
+        socketio.start_background_task(_flush_task_progress, task_id, flush_delay)
+
+
+def _pack_progress_frame(payload: dict) -> Optional[bytes]:
+    """将纯进度更新打包为二进制帧，无法用码表表示时返回 None"""
+    if payload["data"] is not None:
+        return None
+    status_code = PROGRESS_STATUS_CODES.get(payload["status"])
+    text_code = PROGRESS_TEXT_CODES.get(payload["statusText"])
+    if status_code is None or text_code is None:
+        return None
+    try:
+        task_uuid = uuid.UUID(payload["taskId"])
+    except (ValueError, TypeError, AttributeError):
+        return None
+    # uuid.UUID 也接受大写、带花括号或无连字符等写法，前端解码只会还原规范形式
+    if str(task_uuid) != payload["taskId"]:
+        return None
+    return struct.pack(
+        PROGRESS_FRAME_FORMAT, task_uuid.bytes, payload["progress"], status_code, text_code
+    )
+
+
+def _emit_progress(task_id: str, payload: dict):
+    """发送进度更新到对应房间：纯进度走二进制帧，带数据或非常规文本走 JSON"""
+    # 单一订阅者时直接按 sid 发送，省去房间成员解析
+    with _rooms_lock:
+        subscribers = task_subscribers.get(task_id)
+        target = next(iter(subscribers)) if subscribers and len(subscribers) == 1 else task_id
+
+    frame = _pack_progress_frame(payload)
+    if frame is not None:
+        socketio.emit("task_progress_bin", frame, to=target)
+    else:
+        socketio.emit("task_progress", payload, to=target)
+
+
+def _forget_task_progress(task_id: str):
+    """清除任务的节流状态与待补发进度（任务删除时调用）"""
+    with _progress_lock:
+        _progress_state.pop(task_id, None)
+        _pending_progress.pop(task_id, None)
+
+
+def _task_state_key(task) -> tuple:
+    """
+    计算任务状态指纹
+
+    字幕列表按对象、条数和已翻译条数区分：整体替换、增删以及翻译回填都会改变指纹。
+    """
+    subtitles = getattr(task, "subtitles", None) or ()
+    translated = sum(1 for s in subtitles if s.get("translation"))
+    return (
+        *(getattr(task, name, None) for name in _TASK_STATE_FIELDS),
+        id(subtitles),
+        len(subtitles),
+        translated,
+    )
+
+
+def _task_to_dict(task) -> dict:
+    """获取任务字典，任务状态未变时直接返回缓存（调用方不得修改返回值）"""
+    key = _task_state_key(task)
+    cached = _task_dict_cache.get(task.id)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    data = task.to_dict()
+    _task_dict_cache[task.id] = (key, data)
+    return data
+
+
+def _flush_task_progress(task_id: str, delay: float):
+    """补发被合并的最后一帧进度"""
+    socketio.sleep(delay)
+
+    with _progress_lock:
+        payload = _pending_progress.pop(task_id, None)
+        if payload is None:
+            return
+        _progress_state[task_id] = (
+            time.monotonic(),
+            payload["progress"],
+            payload["statusText"],
+        )
+
+    _emit_progress(task_id, payload)
+
+
+def _transcribe_all(task_id: str, audio_path: str, voice_segments: list) -> list:
+    """识别全部语音段，进度只增不减
+
+    所有语音段一次交给识别客户端：各段的前后文重试需要相邻段，
+    按固定边界切块会在每个边界处丢失上下文。
+    """
+    progress_lock = threading.Lock()
+    reported = [25.0]
+
+    def report_progress(percent: float):
+        progress = 25 + min(max(percent, 0.0), 100.0) * 0.4
+        # 在锁内比较并推送，保证进度单调递增
+        with progress_lock:
+            if progress <= reported[0]:
+                return
+            reported[0] = progress
+            task_manager.update_task_status(
+                task_id, TaskStatus.PROCESSING, progress, "正在识别语音..."
+            )
+
+    return sensevoice_client.transcribe_segments(
+        audio_path,
+        voice_segments,
+        language=config.asr_language,
+        on_progress=report_progress,
     )
 
 
+def _hash_file(file_path: str) -> str:
+    """按 1 MiB 分块计算文件内容的 sha256"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _file_content_hash(file_path: str) -> str:
+    """计算文件内容的 sha256，按 (路径, 修改时间, 大小) 记忆避免重复读取"""
+    stat = os.stat(file_path)
+    memo_key = (str(file_path), stat.st_mtime_ns, stat.st_size)
+    cached = _content_hash_cache.get(memo_key)
+    if cached:
+        return cached
+
+    content_hash = _hash_file(str(file_path))
+    _content_hash_cache[memo_key] = content_hash
+    return content_hash
+
+
+def _settings_fingerprint(keys: Tuple[str, ...]) -> str:
+    """对影响结果的配置项取指纹，配置变化时缓存自动失效"""
+    values = {key: getattr(config, key) for key in keys}
+    return hashlib.sha256(json.dumps(values, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def _to_cache_json(value: Any) -> Any:
+    """转换为可 JSON 序列化的结构：元组加标记以便读取时还原，numpy 标量 / 数组转为 Python 值"""
+    if isinstance(value, dict):
+        return {key: _to_cache_json(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return {"__tuple__": [_to_cache_json(item) for item in value]}
+    if isinstance(value, list):
+        return [_to_cache_json(item) for item in value]
+    if hasattr(value, "tolist"):
+        return _to_cache_json(value.tolist())
+    return value
+
+
+def _from_cache_json(obj: dict) -> Any:
+    """json object_hook：还原写入时标记的元组"""
+    if len(obj) == 1 and "__tuple__" in obj:
+        return tuple(obj["__tuple__"])
+    return obj
+
+
+def _load_json_cache(path: Path) -> Any:
+    """读取 JSON 缓存，不存在或损坏时返回 None"""
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"), object_hook=_from_cache_json)
+    except Exception as e:
+        logger.warning(f"读取缓存失败 {path}: {e}")
+        return None
+
+
+def _save_json_cache(path: Path, value: Any):
+    """原子写入 JSON 缓存，写入失败只记录警告，不影响任务"""
+    tmp_path = path.with_name(f"{path.stem}.{uuid.uuid4().hex}.tmp{path.suffix}")
+    try:
+        tmp_path.write_text(
+            json.dumps(_to_cache_json(value), ensure_ascii=False), encoding="utf-8"
+        )
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f"写入缓存失败 {path}: {e}")
+        with suppress(OSError):
+            tmp_path.unlink(missing_ok=True)
+
+
+def _trim_content_cache():
+    """按最近使用时间清理内容缓存，使总大小不超过上限"""
+    cache_root = Path(config.temp_dir) / "cache"
+    if not cache_root.exists():
+        return
+
+    entries = []
+    total = 0
+    for entry_dir in cache_root.iterdir():
+        if not entry_dir.is_dir():
+            continue
+        size = sum(f.stat().st_size for f in entry_dir.iterdir() if f.is_file())
+        entries.append((entry_dir.stat().st_mtime, size, entry_dir))
+        total += size
+
+    removed = 0
+    for _, size, entry_dir in sorted(entries):
+        if total <= CONTENT_CACHE_MAX_BYTES:
+            break
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        total -= size
+        removed += 1
+
+    if removed:
+        logger.info(f"内容缓存清理了 {removed} 个条目")
+
+
+def _tts_audio_path(result: Any) -> Optional[str]:
+    """从 TTS 结果中取出音频路径"""
+    if isinstance(result, str):
+        return result
+    if isinstance(result, dict):
+        return result.get("audio_path")
+    return None
+
+
+def _with_audio_path(result: Any, seg: dict, audio_path: str) -> Any:
+    """按记录的客户端结果构造命中结果：字符串直接换成新路径，字典保留全部字段，
+    只把客户端回传的片段字段更新为当前片段的值并替换 audio_path"""
+    if isinstance(result, str):
+        return audio_path
+    refreshed = {key: seg[key] for key in seg.keys() & result.keys()}
+    return {**result, **refreshed, "audio_path": audio_path}
+
+
+def _dump_tts_result(result: Any) -> Optional[str]:
+    """TTS 客户端结果序列化为 JSON，无法序列化时返回 None（该结果不参与复用）"""
+    try:
+        return json.dumps(_to_cache_json(result), ensure_ascii=False)
+    except (TypeError, ValueError) as e:
+        logger.debug(f"TTS 结果无法序列化，不写入缓存记录: {e}")
+        return None
+
+
+def _load_tts_result(result_json: str) -> Any:
+    """还原 _dump_tts_result 序列化的结果"""
+    return json.loads(result_json, object_hook=_from_cache_json)
+
+
+def _generate_tts_cached(
+    batch: List[dict],
+    voice_name: str,
+    manifest: Dict[str, dict],
+    work_dir: Path,
+    on_generated: Optional[Callable[[str], Any]] = None,
+    on_progress: Optional[Callable[[float], Any]] = None,
+) -> List[Any]:
+    """生成一批配音，命中缓存或断点清单的片段直接复用
+
+    客户端结果原样返回（None 仍为 None）；缓存与清单记录完整的客户端结果，
+    命中时按记录还原，仅替换音频路径。没有记录结果的旧缓存条目视为未命中。
+    缓存命中的音频链接到 work_dir 中使用，不受缓存淘汰影响。
+    on_generated 接收客户端新生成的音频路径，on_progress 转交给客户端。
+    """
+    results: List[Any] = [None] * len(batch)
+    result_jsons: List[Optional[str]] = [None] * len(batch)
+    keys = [
+        TTSCache.make_key(voice_name, config.tts_model, seg["text"], seg["start"], seg["end"])
+        for seg in batch
+    ]
+    missing = []
+
+    for i, (seg, key) in enumerate(zip(batch, keys)):
+        entry = manifest.get(str(seg["id"]))
+        if (
+            entry
+            and entry.get("key") == key
+            and entry.get("result")
+            and Path(entry["audio_path"]).exists()
+        ):
+            results[i] = _with_audio_path(
+                _load_tts_result(entry["result"]), seg, entry["audio_path"]
+            )
+            result_jsons[i] = entry["result"]
+            continue
+
+        cached = tts_cache.get_entry(key, dest_dir=str(work_dir))
+        if cached and cached[1] is not None:
+            results[i] = _with_audio_path(_load_tts_result(cached[1]), seg, cached[0])
+            result_jsons[i] = cached[1]
+        else:
+            missing.append(i)
+
+    if missing:
+        generated = tts_client.generate_batch(
+            [batch[i] for i in missing], voice_name=voice_name, on_progress=on_progress
+        )
+        for i, result in zip(missing, generated):
+            audio_path = _tts_audio_path(result)
+            result_jsons[i] = _dump_tts_result(result)
+            if audio_path and Path(audio_path).exists():
+                tts_cache.put(keys[i], audio_path, result_jsons[i])
+                if on_generated:
+                    on_generated(audio_path)
+            results[i] = result
+
+    # 清单中的结果同样以 JSON 文本保存，与缓存条目一致
+    for seg, key, result, result_json in zip(batch, keys, results, result_jsons):
+        audio_path = _tts_audio_path(result)
+        if audio_path:
+            manifest[str(seg["id"])] = {"key": key, "audio_path": audio_path, "result": result_json}
+
+    return results
+
+
 def process_video_task(task_id: str):
     """异步处理视频任务"""
     task = task_manager.get_task(task_id)
@@ -89,18 +580,37 @@ def process_video_task(task_id: str):
         return
 
     try:
+        # 按源文件内容定位缓存目录，并刷新其最近使用时间
+        cache_dir = Path(config.temp_dir) / "cache" / _file_content_hash(task.file_path)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        os.utime(cache_dir)
+
         # 1. 提取音频
         task_manager.update_task_status(
             task_id, TaskStatus.PROCESSING, 5, "正在提取音频..."
         )
-        audio_path = audio_processor.extract_audio(task.file_path)
+        audio_cache = cache_dir / "audio.wav"
+        if not audio_cache.exists():
+            # 每个任务使用独立的临时文件，同内容的并发任务不会把写了一半的文件换入缓存
+            tmp_audio = cache_dir / f"audio.{task_id}.tmp.wav"
+            try:
+                audio_processor.extract_audio(task.file_path, output_path=str(tmp_audio))
+                os.replace(tmp_audio, audio_cache)
+            finally:
+                _remove_temp_file(tmp_audio)
+        audio_path = str(audio_cache)
         task.audio_path = audio_path
 
         # 2. VAD 语音检测
         task_manager.update_task_status(
             task_id, TaskStatus.PROCESSING, 15, "正在检测语音段落..."
         )
-        voice_segments = vad_processor.process(audio_path)
+        vad_key = _settings_fingerprint(VAD_CACHE_SETTINGS)
+        vad_cache = cache_dir / f"vad_{vad_key}.json"
+        voice_segments = _load_json_cache(vad_cache)
+        if voice_segments is None:
+            voice_segments = vad_processor.process(audio_path)
+            _save_json_cache(vad_cache, voice_segments)
 
         if not voice_segments:
             raise Exception("未检测到语音内容")
@@ -110,15 +620,11 @@ def process_video_task(task_id: str):
             task_id, TaskStatus.PROCESSING, 25, f"正在识别语音 ({len(voice_segments)} 段)..."
         )
 
-        # 分块识别
-        transcription_results = sensevoice_client.transcribe_segments(
-            audio_path,
-            voice_segments,
-            language=config.asr_language,
-            on_progress=lambda p: task_manager.update_task_status(
-                task_id, TaskStatus.PROCESSING, 25 + p * 0.4, "正在识别语音..."
-            ),
-        )
+        asr_cache = cache_dir / f"asr_{vad_key}_{_settings_fingerprint(ASR_CACHE_SETTINGS)}.json"
+        transcription_results = _load_json_cache(asr_cache)
+        if transcription_results is None:
+            transcription_results = _transcribe_all(task_id, audio_path, voice_segments)
+            _save_json_cache(asr_cache, transcription_results)
 
         # 4. 生成原始字幕
         task_manager.update_task_status(
@@ -136,6 +642,39 @@ def process_video_task(task_id: str):
         task_manager.update_task_status(task_id, TaskStatus.FAILED, 0, f"错误: {str(e)}")
 
 
+def _run_job(fn, *args):
+    """占用一个作业槽位运行 fn，槽位已满时等待"""
+    global _job_active
+    with _job_slots:
+        while _job_active >= _job_limit:
+            _job_slots.wait()
+        _job_active += 1
+    try:
+        fn(*args)
+    finally:
+        with _job_slots:
+            _job_active -= 1
+            _job_slots.notify()
+
+
+def _submit_job(fn, *args):
+    """提交后台作业（超出并发上限时排队）"""
+    return job_executor.submit(_run_job, fn, *args)
+
+
+def _set_job_limit(limit: int):
+    """调整同时运行的作业数上限，立即对排队中的作业生效"""
+    global _job_limit
+    limit = max(1, min(int(limit), JOB_MAX_WORKERS))
+    with _job_slots:
+        if _job_limit == limit:
+            return
+        _job_limit = limit
+        # 上限调大时唤醒等待中的作业；调小时正在运行的作业结束后才放行新作业
+        _job_slots.notify_all()
+    logger.info(f"作业并发数已调整为: {limit}")
+
+
 @app.route("/api/translate", methods=["POST"])
 def translate_subtitles():
     """翻译字幕"""
@@ -159,21 +698,17 @@ def translate_subtitles():
         # 更新状态
         task_manager.update_task_status(task_id, TaskStatus.PROCESSING, 70, "正在翻译字幕...")
 
-        # 准备翻译文本
-        texts = [s["text"] for s in task.subtitles]
-
-        # 调用翻译客户端
+        # 整体交给翻译客户端一次调用：客户端内部已按 translation_batch_size 分组、
+        # translation_max_workers 并发，外层再分批只会增加批间等待
         translated_texts = translation_client.translate_batch(
-            texts,
+            [s["text"] for s in task.subtitles],
             target_lang=target_lang,
             on_progress=lambda p: task_manager.update_task_status(
                 task_id, TaskStatus.PROCESSING, 70 + p * 0.2, "正在翻译字幕..."
             ),
         )
-
-        # 更新任务字幕
-        for i, text in enumerate(translated_texts):
-            task.subtitles[i]["translation"] = text
+        for subtitle, text in zip(task.subtitles, translated_texts):
+            subtitle["translation"] = text
 
         # 更新状态
         task_manager.update_task_status(task_id, TaskStatus.COMPLETED, 100, "翻译完成")
@@ -181,7 +716,7 @@ def translate_subtitles():
         return jsonify(
             {
                 "success": True,
-                "data": task.to_dict(),
+                "data": _task_to_dict(task),
                 "message": "翻译成功",
             }
         )
@@ -208,8 +743,9 @@ def run_dubbing():
         if not task:
             return jsonify({"success": False, "error": "任务不存在"}), 404
 
-        # 启动异步配音任务
-        threading.Thread(target=_process_dubbing, args=(task_id, options)).start()
+        # 提交异步配音任务（超出并发上限时排队）
+        task_manager.update_task_status(task_id, TaskStatus.PENDING, 0, "等待配音")
+        _submit_job(_process_dubbing, task_id, options)
 
         return jsonify(
             {
@@ -223,127 +759,178 @@ def run_dubbing():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+def _get_validated_export_dir() -> Optional[Path]:
+    """返回验证可写的自定义导出目录，结果按 export_path 缓存直到配置变更"""
+    global _export_dir_cache
+    export_path = (config.export_path or "").strip()
+    if not export_path:
+        return None
+
+    with _export_dir_lock:
+        if _export_dir_cache and _export_dir_cache[0] == export_path:
+            return _export_dir_cache[1]
+
+        try:
+            export_dir = Path(export_path)
+            # 尝试创建目录以验证有效性
+            export_dir.mkdir(parents=True, exist_ok=True)
+            # 检查是否可写
+            test_file = export_dir / ".write_test"
+            test_file.touch()
+            test_file.unlink()
+        except Exception as e:
+            # 验证失败不缓存，下次重新检测
+            logger.warning(f"自定义导出路径 {config.export_path} 无效或不可写: {e}，将回退")
+            return None
+
+        _export_dir_cache = (export_path, export_dir)
+        logger.info(f"使用验证通过的自定义导出路径: {export_dir}")
+        return export_dir
+
+
 def _process_dubbing(task_id: str, options: dict):
     """处理配音与合成的内部逻辑"""
     task = task_manager.get_task(task_id)
     if not task:
         return
 
-    temp_files = []
-
     try:
-        # 1. TTS 语音合成
-        task_manager.update_task_status(task_id, TaskStatus.PROCESSING, 10, "正在合成配音...")
-
-        # 使用翻译文本进行配音，如果没有翻译则使用原文
-        dubbing_segments = []
-        for s in task.subtitles:
-            text = s.get("translation") or s.get("text")
-            if text:
-                dubbing_segments.append(
-                    {
-                        "id": s["id"],
-                        "text": text,
-                        "start": s["startTime"],
-                        "end": s["endTime"],
-                    }
-                )
-
-        if not dubbing_segments:
-            raise Exception("没有可用于配音的文本内容")
-
-        # 调用 TTS 客户端
-        audio_segments = tts_client.generate_batch(
-            dubbing_segments,
-            voice_name=options.get("voiceName", config.tts_voice_name),
-            on_progress=lambda p: task_manager.update_task_status(
-                task_id, TaskStatus.PROCESSING, 10 + p * 0.4, "正在合成配音..."
-            ),
-        )
-
-        # 2. 视频合成 (压制字幕 + 替换音频)
-        task_manager.update_task_status(task_id, TaskStatus.PROCESSING, 60, "正在合成视频...")
-
-        # 准备输出路径
-        # 去除前缀两端的空格，如果未设置则不使用前缀
-        prefix = config.video_filename_prefix.strip() if config.video_filename_prefix else ""
-        original_stem = Path(task.file_path).stem
-        output_name = f"{prefix}{original_stem}_人声配音版.mp4"
+        # 本次运行产生的临时文件通过 stack.callback(_remove_temp_file, path) 登记，退出时统一清理
+        with ExitStack() as stack:
+            # 1. TTS 语音合成
+            task_manager.update_task_status(task_id, TaskStatus.PROCESSING, 10, "正在合成配音...")
+
+            # 使用翻译文本进行配音，如果没有翻译则使用原文
+            dubbing_segments = []
+            for s in task.subtitles:
+                text = s.get("translation") or s.get("text")
+                if text:
+                    dubbing_segments.append(
+                        {
+                            "id": s["id"],
+                            "text": text,
+                            "start": s["startTime"],
+                            "end": s["endTime"],
+                        }
+                    )
+
+            if not dubbing_segments:
+                raise Exception("没有可用于配音的文本内容")
+
+            voice_name = options.get("voiceName", config.tts_voice_name)
+
+            # 断点清单：记录已合成的片段，崩溃后重试可直接复用
+            manifest_path = Path(config.temp_dir) / f"tts_{task_id}.json"
+            stack.callback(_remove_temp_file, manifest_path)
+            # 缓存命中的音频链接到任务自己的工作目录，避免被并发任务触发的 LRU 淘汰删除
+            work_dir = Path(config.temp_dir) / f"tts_{task_id}"
+            stack.callback(shutil.rmtree, work_dir, ignore_errors=True)
+            manifest: Dict[str, dict] = {}
+            if manifest_path.exists():
+                try:
+                    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+                except Exception as me:
+                    logger.warning(f"读取配音清单失败，将重新生成: {me}")
+
+            # 调用 TTS 客户端（优先使用缓存；未命中的片段一次交给客户端，
+            # 由其按 tts_batch_size / tts_max_workers 分批并发）。
+            # TTS 客户端新生成的音频已复制进缓存，本次运行结束后删除原文件
+            audio_segments = _generate_tts_cached(
+                dubbing_segments,
+                voice_name,
+                manifest,
+                work_dir,
+                on_generated=lambda path: stack.callback(_remove_temp_file, path),
+                on_progress=lambda p: task_manager.update_task_status(
+                    task_id, TaskStatus.PROCESSING, 10 + p * 0.4, "正在合成配音..."
+                ),
+            )
+            manifest_path.write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+
+            # 2. 视频合成 (压制字幕 + 替换音频)
+            task_manager.update_task_status(task_id, TaskStatus.PROCESSING, 60, "正在合成视频...")
+
+            # 准备输出路径
+            # 去除前缀两端的空格，如果未设置则不使用前缀
+            prefix = config.video_filename_prefix.strip() if config.video_filename_prefix else ""
+            original_stem = Path(task.file_path).stem
+            output_name = f"{prefix}{original_stem}_人声配音版.mp4"
+
+            # 增加对自定义路径有效性的验证，如果路径不可写或无效，则回退
+            export_dir = _get_validated_export_dir()
+
+            if not export_dir:
+                if config.use_source_folder and task.file_path:
+                    export_dir = Path(task.file_path).parent
+                    logger.info(f"回退到原视频所在目录: {export_dir}")
+                else:
+                    export_dir = Path(config.output_dir)
+                    logger.info(f"回退到默认输出目录: {export_dir}")
+                export_dir.mkdir(parents=True, exist_ok=True)
+
+            output_path = str(export_dir / output_name)
+
+            # 压制参数
+            synthesize_options = {
+                "subtitles": task.subtitles,
+                "audio_segments": audio_segments,
+                "subtitle_style": config.subtitle_style,
+                "bilingual": options.get("bilingual", False),
+                "original_audio_volume": options.get("originalAudioVolume", 0.1),
+                "dubbing_volume": options.get("dubbingVolume", 1.0),
+            }
 
-        # 增加对自定义路径有效性的验证，如果路径不可写或无效，则回退
-        export_dir = None
-        if config.export_path and config.export_path.strip():
-            try:
-                temp_dir = Path(config.export_path.strip())
-                # 尝试创建目录以验证有效性
-                temp_dir.mkdir(parents=True, exist_ok=True)
-                # 检查是否可写
-                test_file = temp_dir / ".write_test"
-                test_file.touch()
-                test_file.unlink()
-                export_dir = temp_dir
-                logger.info(f"使用验证通过的自定义导出路径: {export_dir}")
-            except Exception as e:
-                logger.warning(f"自定义导出路径 {config.export_path} 无效或不可写: {e}，将回退")
-
-        if not export_dir:
-            if config.use_source_folder and task.file_path:
-                export_dir = Path(task.file_path).parent
-                logger.info(f"回退到原视频所在目录: {export_dir}")
-            else:
-                export_dir = Path(config.output_dir)
-                logger.info(f"回退到默认输出目录: {export_dir}")
-
-        export_dir.mkdir(parents=True, exist_ok=True)
-        output_path = str(export_dir / output_name)
-
-        # 压制参数
-        synthesize_options = {
-            "subtitles": task.subtitles,
-            "audio_segments": audio_segments,
-            "subtitle_style": config.subtitle_style,
-            "bilingual": options.get("bilingual", False),
-            "original_audio_volume": options.get("originalAudioVolume", 0.1),
-            "dubbing_volume": options.get("dubbingVolume", 1.0),
-        }
-
-        # 调用合成引擎
-        result_path = video_synthesizer.synthesize(
-            task.file_path,
-            output_path,
-            **synthesize_options,
-            on_progress=lambda p: task_manager.update_task_status(
-                task_id, TaskStatus.PROCESSING, 60 + p * 0.35, "正在合成视频..."
-            ),
-        )
+            # 调用合成引擎
+            result_path = video_synthesizer.synthesize(
+                task.file_path,
+                output_path,
+                **synthesize_options,
+                on_progress=lambda p: task_manager.update_task_status(
+                    task_id, TaskStatus.PROCESSING, 60 + p * 0.35, "正在合成视频..."
+                ),
+            )
 
-        task.output_video_path = result_path
+            task.output_video_path = result_path
 
-        # 3. 清理预览图 (清理 temp_dir 下所有预览图)
-        try:
-            temp_dir_path = Path(config.temp_dir)
-            for f in temp_dir_path.glob("preview_*.png"):
-                f.unlink(missing_ok=True)
-            logger.info("已清理所有临时预览图")
-        except Exception as pe:
-            logger.debug(f"清理预览图失败: {pe}")
+            # 3. 后台清理过期预览图，不阻塞完成状态
+            _preview_cleanup_executor.submit(_prune_previews, config.temp_dir, max_age_s=3600)
 
-        # 4. 完成
-        task_manager.update_task_status(task_id, TaskStatus.COMPLETED, 100, "配音合成完成")
-        logger.info(f"任务 {task_id} 配音合成成功: {result_path}")
+            # 4. 完成
+            task_manager.update_task_status(task_id, TaskStatus.COMPLETED, 100, "配音合成完成")
+            logger.info(f"任务 {task_id} 配音合成成功: {result_path}")
 
     except Exception as e:
         logger.error(f"任务 {task_id} 配音合成失败: {e}")
         task_manager.update_task_status(task_id, TaskStatus.FAILED, 0, f"错误: {str(e)}")
 
-    finally:
-        # 清理临时文件
-        for f in temp_files:
-            try:
-                if os.path.exists(f):
-                    os.remove(f)
-            except:
-                pass
+
+def _remove_temp_file(path: str):
+    """删除临时文件，文件不存在时忽略"""
+    try:
+        Path(path).unlink(missing_ok=True)
+    except OSError as e:
+        logger.debug(f"删除临时文件失败 {path}: {e}")
+
+
+def _prune_previews(temp_dir: str, max_age_s: float = 3600):
+    """删除 temp_dir 下超过 max_age_s 秒的预览图"""
+    try:
+        cutoff = time.time() - max_age_s
+        count = 0
+        with os.scandir(temp_dir) as entries:
+            for entry in entries:
+                if not (entry.name.startswith("preview_") and entry.name.endswith(".png")):
+                    continue
+                try:
+                    if entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                        os.unlink(entry.path)
+                        count += 1
+                except FileNotFoundError:
+                    pass
+        if count:
+            logger.info(f"已清理 {count} 张过期预览图")
+    except Exception as pe:
+        logger.debug(f"清理预览图失败: {pe}")
 
 
 @app.route("/api/preview-subtitle", methods=["POST"])
@@ -414,10 +1001,11 @@ def create_task():
 
         logger.info(f"API创建任务: {task.id} - {task.file_name}")
 
-        # 启动异步处理
-        threading.Thread(target=process_video_task, args=(task.id,)).start()
+        # 提交异步处理（超出并发上限时排队）
+        task_manager.update_task_status(task.id, TaskStatus.PENDING, 0, "等待处理")
+        _submit_job(process_video_task, task.id)
 
-        return jsonify({"success": True, "data": task.to_dict()})
+        return jsonify({"success": True, "data": _task_to_dict(task)})
 
     except Exception as e:
         logger.error(f"创建任务失败: {e}")
@@ -433,7 +1021,7 @@ def get_task(task_id):
         if not task:
             return jsonify({"success": False, "error": "任务不存在"}), 404
 
-        return jsonify({"success": True, "data": task.to_dict()})
+        return jsonify({"success": True, "data": _task_to_dict(task)})
 
     except Exception as e:
         logger.error(f"获取任务失败: {e}")
@@ -445,6 +1033,8 @@ def delete_task(task_id):
     """删除任务"""
     try:
         success = task_manager.delete_task(task_id)
+        _task_dict_cache.pop(task_id, None)
+        _forget_task_progress(task_id)
 
         if not success:
             return jsonify({"success": False, "error": "任务不存在"}), 404
@@ -468,10 +1058,10 @@ def retry_task(task_id):
         # 重置状态
         task_manager.update_task_status(task_id, TaskStatus.PENDING, 0, "等待重试")
 
-        # 启动异步处理
-        threading.Thread(target=process_video_task, args=(task_id,)).start()
+        # 提交异步处理（超出并发上限时排队）
+        _submit_job(process_video_task, task_id)
 
-        return jsonify({"success": True, "data": task.to_dict()})
+        return jsonify({"success": True, "data": _task_to_dict(task)})
 
     except Exception as e:
         logger.error(f"重试任务失败: {e}")
@@ -484,13 +1074,17 @@ def get_all_tasks():
     try:
         tasks = task_manager.get_all_tasks()
 
-        return jsonify({"success": True, "data": [task.to_dict() for task in tasks]})
+        return jsonify({"success": True, "data": [_task_to_dict(task) for task in tasks]})
 
     except Exception as e:
         logger.error(f"获取任务列表失败: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+# 导出字幕时提取的字段
+_SUBTITLE_EXPORT_FIELDS = itemgetter("id", "startTime", "endTime", "text")
+
+
 @app.route("/api/export", methods=["POST"])
 def export_subtitles():
     """导出字幕"""
@@ -534,15 +1128,10 @@ def export_subtitles():
             output_path = Path(output_path)
             output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # 转换字幕格式
+        # 转换字幕格式（导出器可能多次遍历或取长度，传入列表）
         segments = [
-            {
-                "id": s["id"],
-                "start": s["startTime"],
-                "end": s["endTime"],
-                "text": s["text"],
-            }
-            for s in task.subtitles
+            {"id": sid, "start": start, "end": end, "text": text}
+            for sid, start, end, text in map(_SUBTITLE_EXPORT_FIELDS, task.subtitles)
         ]
 
         # 导出
@@ -578,6 +1167,63 @@ def get_settings():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+# 前端设置键名映射 (camelCase -> snake_case)
+_SETTINGS_KEY_MAPPING = MappingProxyType(
+    {
+        "apiKey": "api_key",
+        "vadSensitivity": "vad_sensitivity",
+        "minSilenceDuration": "min_silence_duration",
+        "mergeThreshold": "merge_threshold",
+        "defaultExportFormat": "default_export_format",
+        "maxConcurrentTasks": "max_concurrent_tasks",
+        "asrLanguage": "asr_language",
+        "maxSubtitleLength": "max_subtitle_length",
+        "enableMaxSubtitleLength": "enable_max_subtitle_length",
+        "maxSpeechDuration": "max_speech_duration",
+        "languageGuard": "language_guard",
+        "autoRemoveDrift": "auto_remove_drift",
+        "contextRetry": "context_retry",
+        "contextRetryPadding": "context_retry_padding",
+        "apiBaseUrl": "api_base_url",
+        "apiModel": "api_model",
+        "translationModel": "translation_model",
+        "translationTargetLang": "translation_target_lang",
+        "customTranslationModels": "custom_translation_models",
+        "translationBatchSize": "translation_batch_size",
+        "translationMaxWorkers": "translation_max_workers",
+        "ttsMaxWorkers": "tts_max_workers",
+        "subtitleStyle": "subtitle_style",
+        "exportPath": "export_path",
+        "exportSubtitlePath": "export_subtitle_path",
+        "useSourceFolder": "use_source_folder",
+        "videoFilenamePrefix": "video_filename_prefix",
+    }
+)
+
+# 数值配置项校验表: (键名, 类型, 最小值, 最大值)
+_SETTINGS_VALIDATORS = (
+    ("max_concurrent_tasks", int, 1, 20),
+    ("vad_sensitivity", float, 0.1, 0.9),
+    ("min_silence_duration", float, 0.01, 2.0),
+    ("merge_threshold", float, 0.0, 2.0),
+    ("max_subtitle_length", int, 5, 200),
+    ("max_speech_duration", float, 1.0, 60.0),
+    ("context_retry_padding", float, 0.0, 1.0),
+    ("translation_batch_size", int, 1, 100),
+    ("translation_max_workers", int, 1, 10),
+    ("tts_max_workers", int, 1, 20),
+)
+
+# 布尔配置项
+_SETTINGS_BOOL_KEYS = (
+    "language_guard",
+    "context_retry",
+    "auto_remove_drift",
+    "enable_max_subtitle_length",
+    "use_source_folder",
+)
+
+
 @app.route("/api/settings", methods=["POST"])
 def save_settings():
     """保存配置"""
@@ -587,132 +1233,20 @@ def save_settings():
         if not data:
             return jsonify({"success": False, "error": "缺少配置数据"}), 400
 
-        mapping = {
-            "apiKey": "api_key",
-            "vadSensitivity": "vad_sensitivity",
-            "minSilenceDuration": "min_silence_duration",
-            "mergeThreshold": "merge_threshold",
-            "defaultExportFormat": "default_export_format",
-            "maxConcurrentTasks": "max_concurrent_tasks",
-            "asrLanguage": "asr_language",
-            "maxSubtitleLength": "max_subtitle_length",
-            "enableMaxSubtitleLength": "enable_max_subtitle_length",
-            "maxSpeechDuration": "max_speech_duration",
-            "languageGuard": "language_guard",
-            "autoRemoveDrift": "auto_remove_drift",
-            "contextRetry": "context_retry",
-            "contextRetryPadding": "context_retry_padding",
-            "apiBaseUrl": "api_base_url",
-            "apiModel": "api_model",
-            "translationModel": "translation_model",
-            "translationTargetLang": "translation_target_lang",
-            "customTranslationModels": "custom_translation_models",
-            "translationBatchSize": "translation_batch_size",
-            "translationMaxWorkers": "translation_max_workers",
-            "ttsMaxWorkers": "tts_max_workers",
-            "subtitleStyle": "subtitle_style",
-            "exportPath": "export_path",
-            "exportSubtitlePath": "export_subtitle_path",
-            "useSourceFolder": "use_source_folder",
-            "videoFilenamePrefix": "video_filename_prefix",
-        }
-
-        if "tts_max_workers" in data:
-            try:
-                data["tts_max_workers"] = max(1, min(10, int(data["tts_max_workers"])))
-            except Exception:
-                data.pop("tts_max_workers", None)
-
-        for camel, snake in mapping.items():
+        # camelCase -> snake_case
+        for camel, snake in _SETTINGS_KEY_MAPPING.items():
             if camel in data and snake not in data:
                 data[snake] = data[camel]
 
-        if "max_concurrent_tasks" in data:
-            try:
-                data["max_concurrent_tasks"] = max(
-                    1, min(20, int(data["max_concurrent_tasks"]))
-                )
-            except Exception:
-                data.pop("max_concurrent_tasks", None)
-
-        if "vad_sensitivity" in data:
-            try:
-                data["vad_sensitivity"] = max(
-                    0.1, min(0.9, float(data["vad_sensitivity"]))
-                )
-            except Exception:
-                data.pop("vad_sensitivity", None)
-
-        if "min_silence_duration" in data:
-            try:
-                data["min_silence_duration"] = max(
-                    0.01, min(2.0, float(data["min_silence_duration"]))
-                )
-            except Exception:
-                data.pop("min_silence_duration", None)
-
-        if "merge_threshold" in data:
-            try:
-                data["merge_threshold"] = max(
-                    0.0, min(2.0, float(data["merge_threshold"]))
-                )
-            except Exception:
-                data.pop("merge_threshold", None)
-
-        if "max_subtitle_length" in data:
-            try:
-                data["max_subtitle_length"] = max(
-                    5, min(200, int(data["max_subtitle_length"]))
-                )
-            except Exception:
-                data.pop("max_subtitle_length", None)
-
-        if "max_speech_duration" in data:
-            try:
-                data["max_speech_duration"] = max(
-                    1.0, min(60.0, float(data["max_speech_duration"]))
-                )
-            except Exception:
-                data.pop("max_speech_duration", None)
-
-        if "context_retry_padding" in data:
-            try:
-                data["context_retry_padding"] = max(
-                    0.0, min(1.0, float(data["context_retry_padding"]))
-                )
-            except Exception:
-                data.pop("context_retry_padding", None)
-
-        if "translation_batch_size" in data:
-            try:
-                data["translation_batch_size"] = max(
-                    1, min(100, int(data["translation_batch_size"]))
-                )
-            except Exception:
-                data.pop("translation_batch_size", None)
-
-        if "translation_max_workers" in data:
-            try:
-                data["translation_max_workers"] = max(
-                    1, min(10, int(data["translation_max_workers"]))
-                )
-            except Exception:
-                data.pop("translation_max_workers", None)
+        # 数值项类型转换与范围限制，非法值直接丢弃
+        for key, cast, lo, hi in _SETTINGS_VALIDATORS:
+            if key in data:
+                try:
+                    data[key] = max(lo, min(hi, cast(data[key])))
+                except Exception:
+                    data.pop(key, None)
 
-        if "tts_max_workers" in data:
-            try:
-                data["tts_max_workers"] = max(1, min(20, int(data["tts_max_workers"])))
-                logger.info(f"设置 tts_max_workers 为: {data['tts_max_workers']}")
-            except Exception:
-                data.pop("tts_max_workers", None)
-
-        for key in (
-            "language_guard",
-            "context_retry",
-            "auto_remove_drift",
-            "enable_max_subtitle_length",
-            "use_source_folder",
-        ):
+        for key in _SETTINGS_BOOL_KEYS:
             if key in data:
                 val = data[key]
                 if isinstance(val, str):
@@ -723,6 +1257,11 @@ def save_settings():
         # 更新配置
         config.update(**data)
 
+        if "export_path" in data or "use_source_folder" in data:
+            _invalidate_export_dir_cache()
+        if "temp_dir" in data:
+            _refresh_upload_dir()
+
         logger.info(f"配置更新完成，关键配置项：")
         logger.info(f"  - tts_max_workers: {config.tts_max_workers}")
         logger.info(f"  - export_path: {config.export_path}")
@@ -730,6 +1269,7 @@ def save_settings():
 
         if "max_concurrent_tasks" in data:
             task_manager.set_max_concurrent(data["max_concurrent_tasks"])
+            _set_job_limit(data["max_concurrent_tasks"])
 
         # 如果更新了 API Key，同步更新 SenseVoice 客户端
         if "api_key" in data:
@@ -752,6 +1292,13 @@ def save_settings():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+def _invalidate_export_dir_cache():
+    """导出相关配置变更后清除导出目录缓存"""
+    global _export_dir_cache
+    with _export_dir_lock:
+        _export_dir_cache = None
+
+
 @app.route("/api/check-api-key", methods=["POST"])
 def check_api_key():
     """检查 API Key"""
@@ -792,14 +1339,11 @@ def upload_file():
             return jsonify({"success": False, "error": "文件名空"}), 400
 
         # 保存到临时目录
-        from werkzeug.utils import secure_filename
-
         filename = secure_filename(file.filename)
-        upload_dir = Path(config.temp_dir) / "uploads"
-        upload_dir.mkdir(parents=True, exist_ok=True)
-
-        filepath = upload_dir / filename
-        file.save(str(filepath))
+        filepath = _UPLOAD_DIR / filename
+        # Werkzeug 已将上传内容缓冲（大文件落入临时文件），这里按 1MB 块复制到上传目录
+        with open(filepath, "wb", buffering=UPLOAD_BUFFER_SIZE) as out:
+            shutil.copyfileobj(file.stream, out, length=UPLOAD_BUFFER_SIZE)
 
         logger.info(f"文件上传成功: {filepath}")
 
@@ -820,6 +1364,58 @@ def upload_file():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@app.route("/api/upload/chunk", methods=["POST"])
+def upload_file_chunk():
+    """分块上传视频文件（按偏移量追加，支持断点续传）"""
+    try:
+        if "file" not in request.files:
+            return jsonify({"success": False, "error": "没有文件"}), 400
+
+        filename = secure_filename(request.form.get("fileName", ""))
+        if not filename:
+            return jsonify({"success": False, "error": "文件名空"}), 400
+
+        try:
+            offset = int(request.form.get("offset", 0))
+        except ValueError:
+            return jsonify({"success": False, "error": "offset 参数无效"}), 400
+
+        filepath = _UPLOAD_DIR / filename
+
+        # 偏移量必须等于已上传大小，否则返回当前大小供客户端续传
+        current_size = filepath.stat().st_size if filepath.exists() else 0
+        if offset != 0 and offset != current_size:
+            return (
+                jsonify(
+                    {
+                        "success": False,
+                        "error": "分块偏移量与已上传大小不一致",
+                        "data": {"fileSize": current_size},
+                    }
+                ),
+                409,
+            )
+
+        mode = "ab" if offset else "wb"
+        with open(filepath, mode, buffering=UPLOAD_BUFFER_SIZE) as out:
+            shutil.copyfileobj(request.files["file"].stream, out, length=UPLOAD_BUFFER_SIZE)
+
+        return jsonify(
+            {
+                "success": True,
+                "data": {
+                    "filePath": str(filepath),
+                    "fileName": filename,
+                    "fileSize": filepath.stat().st_size,
+                },
+            }
+        )
+
+    except Exception as e:
+        logger.error(f"分块上传失败: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 @app.route("/api/video-info", methods=["POST"])
 def get_video_info():
     """获取视频信息"""
@@ -856,6 +1452,25 @@ def get_video_info():
 # ==================== WebSocket Events ====================
 
 
+def _bind_task_room(task_id: str, sid: str):
+    """记录任务房间与客户端的映射"""
+    with _rooms_lock:
+        task_rooms[task_id] = sid
+        sid_to_tasks[sid].add(task_id)
+        task_subscribers[task_id].add(sid)
+
+
+def _unbind_task_room_locked(task_id: str, sid: str):
+    """移除任务房间与客户端的映射（调用方需持有 _rooms_lock）"""
+    if task_rooms.get(task_id) == sid:
+        del task_rooms[task_id]
+    subscribers = task_subscribers.get(task_id)
+    if subscribers is not None:
+        subscribers.discard(sid)
+        if not subscribers:
+            del task_subscribers[task_id]
+
+
 @socketio.on("connect")
 def handle_connect():
     """客户端连接"""
@@ -869,13 +1484,9 @@ def handle_disconnect():
     logger.debug(f"客户端已断开: {request.sid}")
 
     # 清理房间映射
-    rooms_to_remove = []
-    for task_id, sid in task_rooms.items():
-        if sid == request.sid:
-            rooms_to_remove.append(task_id)
-
-    for task_id in rooms_to_remove:
-        del task_rooms[task_id]
+    with _rooms_lock:
+        for task_id in sid_to_tasks.pop(request.sid, ()):
+            _unbind_task_room_locked(task_id, request.sid)
 
 
 @socketio.on("join_task")
@@ -888,14 +1499,14 @@ def handle_join_task(data):
         return
 
     join_room(task_id)
-    task_rooms[task_id] = request.sid
+    _bind_task_room(task_id, request.sid)
 
     logger.debug(f"客户端 {request.sid} 加入任务房间: {task_id}")
 
     # 发送当前任务状态
     task = task_manager.get_task(task_id)
     if task:
-        emit("task_status", task.to_dict())
+        emit("task_status", _task_to_dict(task))
 
 
 @socketio.on("leave_task")
@@ -905,7 +1516,9 @@ def handle_leave_task(data):
 
     if task_id:
         leave_room(task_id)
-        task_rooms.pop(task_id, None)
+        with _rooms_lock:
+            _unbind_task_room_locked(task_id, request.sid)
+            sid_to_tasks.get(request.sid, set()).discard(task_id)
         logger.debug(f"客户端 {request.sid} 离开任务房间: {task_id}")
 
 
@@ -916,7 +1529,7 @@ def handle_subscribe_progress(data):
 
     if task_id:
         join_room(task_id)
-        task_rooms[task_id] = request.sid
+        _bind_task_room(task_id, request.sid)
         emit("subscribed", {"taskId": task_id})
 
 
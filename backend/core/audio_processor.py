@@ -1,18 +1,48 @@
 """音频处理模块 - 使用 FFmpeg 和 pydub 提取音频"""
 
 import os
+import json
+import time
+import atexit
+import shutil
 import tempfile
+import threading
+import functools
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Tuple, Callable
+from typing import Dict, Optional, Tuple, Callable, List, Sequence, Iterator
 import subprocess
 
+import numpy as np
 from pydub import AudioSegment
+from pydub import utils as pydub_utils
 
 from utils.logger import get_logger
 from utils.config import get_config
+from core.ffmpeg_pipeline import FfmpegPipeline, read_wav_stream
 
 logger = get_logger("audio_processor")
 
+# 媒体时长缓存：最多保留的条目数，以及累计多少条新结果 / 间隔多少秒写一次盘
+DURATION_CACHE_MAX_ENTRIES = 2000
+DURATION_CACHE_SAVE_BATCH = 32
+DURATION_CACHE_SAVE_INTERVAL = 60.0
+
+# pydub 每次解码都会通过 which() 遍历 PATH 查找 ffprobe/ffmpeg，缓存查找结果
+if not hasattr(pydub_utils.which, "cache_info"):
+    pydub_utils.which = functools.lru_cache(maxsize=16)(pydub_utils.which)
+
+# 尝试导入 soundfile，用于只读文件头获取音频信息
+try:
+    import soundfile as sf
+
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+    logger.warning("soundfile 不可用，音频时长将通过 ffprobe/pydub 获取")
+
 # 尝试导入 ffmpeg-python，如果失败则使用备用方案
 try:
     import ffmpeg
@@ -23,6 +53,184 @@ except ImportError:
     logger.warning("ffmpeg-python 不可用，将使用备用方案")
 
 
+# 已找到的 FFmpeg 路径；查找失败不缓存，安装 FFmpeg 后无需重启即可重新发现
+_ffmpeg_path_found: Optional[str] = None
+
+
+def _discover_ffmpeg() -> Optional[str]:
+    """查找 FFmpeg 可执行文件（找到后每个进程只查找一次）"""
+    global _ffmpeg_path_found
+    if _ffmpeg_path_found is None:
+        _ffmpeg_path_found = _search_ffmpeg()
+    return _ffmpeg_path_found
+
+
+def _search_ffmpeg() -> Optional[str]:
+    """依次在项目目录和 PATH 中查找 FFmpeg"""
+    # 从当前文件位置向上查找项目根目录 (backend/core -> backend -> project_root)
+    project_root = Path(__file__).parent.parent.parent
+    ffmpeg_dir = project_root / "ffmpeg"
+
+    # 1. 检查项目目录下的 ffmpeg 文件夹（直接放置）
+    local_ffmpeg = ffmpeg_dir / "ffmpeg.exe"
+    if local_ffmpeg.exists():
+        return str(local_ffmpeg)
+
+    # 2. 检查子目录结构（如 ffmpeg-master-latest-win64-gpl/bin/）
+    for subdir in ffmpeg_dir.iterdir():
+        if subdir.is_dir():
+            nested_ffmpeg = subdir / "bin" / "ffmpeg.exe"
+            if nested_ffmpeg.exists():
+                return str(nested_ffmpeg)
+
+    # 3. 检查环境变量 PATH
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-version"], capture_output=True, timeout=5
+        )
+        if result.returncode == 0:
+            return "ffmpeg"
+    except:
+        pass
+
+    return None
+
+
+# 已找到的 ffprobe 路径，按 (配置路径, ffmpeg 路径) 缓存；未找到时不缓存，安装后无需重启即可生效
+_ffprobe_paths_found: Dict[Tuple[str, Optional[str]], str] = {}
+
+
+def _discover_ffprobe(configured_path: str, ffmpeg_path: Optional[str]) -> Optional[str]:
+    """查找 ffprobe 可执行文件（找到后相同参数只查找一次）"""
+    key = (configured_path, ffmpeg_path)
+    found = _ffprobe_paths_found.get(key)
+    if found is None:
+        found = _search_ffprobe(configured_path, ffmpeg_path)
+        if found is not None:
+            _ffprobe_paths_found[key] = found
+    return found
+
+
+def _search_ffprobe(configured_path: str, ffmpeg_path: Optional[str]) -> Optional[str]:
+    """依次在配置路径、ffmpeg 所在目录和 PATH 中查找 ffprobe"""
+    # 1. 优先使用配置路径
+    if configured_path and os.path.exists(configured_path):
+        return configured_path
+
+    # 2. 尝试与 ffmpeg 在同一目录
+    if ffmpeg_path and ffmpeg_path != "ffmpeg":
+        ffprobe_path = Path(ffmpeg_path).parent / "ffprobe.exe"
+        if ffprobe_path.exists():
+            return str(ffprobe_path)
+
+    # 3. 尝试系统 PATH
+    try:
+        result = subprocess.run(["ffprobe", "-version"], capture_output=True, timeout=2)
+        if result.returncode == 0:
+            return "ffprobe"
+    except:
+        pass
+
+    return None
+
+
+@functools.lru_cache(maxsize=128)
+def _build_atempo(speed_factor: float) -> str:
+    """
+    构造 atempo 滤镜链
+
+    ffmpeg 的 atempo 滤镜限制在 0.5 到 2.0 之间，超出范围需要串联
+    """
+    filters = []
+    temp_factor = speed_factor
+
+    while temp_factor > 2.0:
+        filters.append("atempo=2.0")
+        temp_factor /= 2.0
+    while temp_factor < 0.5:
+        filters.append("atempo=0.5")
+        temp_factor /= 0.5
+    filters.append(f"atempo={temp_factor}")
+
+    return ",".join(filters)
+
+
+# 解码器名 -> 编码器名（不在表中的沿用同名编码器）
+_AUDIO_ENCODERS = {
+    "mp3": "libmp3lame",
+    "opus": "libopus",
+    "vorbis": "libvorbis",
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _probe_audio_stream(
+    ffprobe_path: str, media_path: str, mtime_ns: int, size: int
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    读取首个音频流的编码与码率（mtime/size 参与缓存键，文件变化后重新探测）
+
+    Returns:
+        (codec_name, bit_rate)，探测失败时为 (None, None)
+    """
+    cmd = [
+        ffprobe_path,
+        "-v",
+        "error",
+        "-select_streams",
+        "a:0",
+        "-show_entries",
+        "stream=codec_name,bit_rate",
+        "-of",
+        "json",
+        media_path,
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        streams = json.loads(result.stdout).get("streams") or [{}]
+    except (OSError, subprocess.CalledProcessError, ValueError):
+        return None, None
+    return streams[0].get("codec_name"), streams[0].get("bit_rate")
+
+
+@dataclass
+class ChunkBatch:
+    """
+    split_audio 的分块结果（SoA 布局）
+
+    各块共享同一个 PCM 缓冲区，第 i 块为 pcm[offsets[i, 0]:offsets[i, 1]]。
+    相邻块存在重叠，因此每块单独记录起止采样点，而不是只记录一组分界点。
+    """
+
+    starts: np.ndarray  # 每块起始时间（秒），float64
+    ends: np.ndarray  # 每块结束时间（秒），float64
+    pcm: np.ndarray  # 整段 int16 采样
+    sr: int  # 采样率
+    offsets: np.ndarray  # 形状 (n, 2) 的起止采样点，int64
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, idx: int) -> Tuple[float, float, np.ndarray]:
+        begin, end = self.offsets[idx]
+        return float(self.starts[idx]), float(self.ends[idx]), self.pcm[begin:end]
+
+    def __iter__(self) -> Iterator[Tuple[float, float, np.ndarray]]:
+        """兼容旧接口：逐块产出 (start_time, end_time, pcm_view)"""
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def raw(self, idx: int) -> memoryview:
+        """第 idx 块的 PCM 字节视图（不复制，可直接交给接受 bytes-like 的客户端）"""
+        begin, end = self.offsets[idx]
+        return memoryview(self.pcm[begin:end]).cast("B")
+
+    @property
+    def durations(self) -> np.ndarray:
+        """每块时长（秒）"""
+        return self.ends - self.starts
+
+
 class AudioProcessor:
     """音频处理器"""
 
@@ -38,6 +246,15 @@ class AudioProcessor:
             AudioSegment.ffprobe = self.config.ffprobe_path
             
         self.ffmpeg_path = self.config.ffmpeg_path or self._find_ffmpeg()
+
+        # 媒体时长缓存：键为 路径|mtime_ns|size，按最近使用排序，持久化到临时目录
+        self._duration_lock = threading.Lock()
+        self._duration_cache_path = self.temp_dir / "duration_cache.json"
+        self._duration_cache = self._load_duration_cache()
+        self._duration_unsaved = 0
+        self._duration_saved_at = time.monotonic()
+        atexit.register(self.flush_duration_cache)
+
         logger.info(f"音频处理器初始化完成，临时目录: {self.temp_dir}")
         if self.ffmpeg_path:
             logger.info(f"FFmpeg 路径: {self.ffmpeg_path}")
@@ -46,35 +263,7 @@ class AudioProcessor:
 
     def _find_ffmpeg(self) -> Optional[str]:
         """查找 FFmpeg 可执行文件"""
-        # 从当前文件位置向上查找项目根目录 (backend/core -> backend -> project_root)
-        project_root = Path(__file__).parent.parent.parent
-        ffmpeg_dir = project_root / "ffmpeg"
-
-        # 1. 检查项目目录下的 ffmpeg 文件夹（直接放置）
-        local_ffmpeg = ffmpeg_dir / "ffmpeg.exe"
-        if local_ffmpeg.exists():
-            return str(local_ffmpeg)
-
-        # 2. 检查子目录结构（如 ffmpeg-master-latest-win64-gpl/bin/）
-        for subdir in ffmpeg_dir.iterdir():
-            if subdir.is_dir():
-                nested_ffmpeg = subdir / "bin" / "ffmpeg.exe"
-                if nested_ffmpeg.exists():
-                    return str(nested_ffmpeg)
-
-        # 3. 检查环境变量 PATH
-        try:
-            import subprocess
-
-            result = subprocess.run(
-                ["ffmpeg", "-version"], capture_output=True, timeout=5
-            )
-            if result.returncode == 0:
-                return "ffmpeg"
-        except:
-            pass
-
-        return None
+        return _discover_ffmpeg()
 
     def extract_audio(
         self,
@@ -136,10 +325,24 @@ class AudioProcessor:
                 str(channels),
                 "-vn",  # 不保留视频
                 "-y",  # 覆盖输出文件
+                "-progress",
+                "pipe:1",  # 以 key=value 形式向 stdout 输出进度
+                "-nostats",
+                "-loglevel",
+                "error",
                 str(output_path),
             ]
 
-            subprocess.run(cmd, check=True, capture_output=True, text=True)
+            total_duration = None
+            if progress_callback:
+                try:
+                    total_duration = self.get_video_duration(str(video_path))
+                except Exception:
+                    pass
+
+            self._run_ffmpeg_with_progress(
+                cmd, total_duration, progress_callback, "正在提取音频..."
+            )
 
             if progress_callback:
                 progress_callback(100, "音频提取完成")
@@ -147,17 +350,174 @@ class AudioProcessor:
             logger.info(f"音频提取完成: {output_path}")
             return str(output_path)
 
-        except subprocess.CalledProcessError as e:
-            error_msg = f"FFmpeg 错误: {e.stderr if e.stderr else str(e)}"
-            logger.error(error_msg)
-            raise RuntimeError(error_msg)
         except Exception as e:
             logger.error(f"提取音频失败: {e}")
             raise
 
+    def _run_ffmpeg_with_progress(
+        self,
+        cmd: List[str],
+        total_duration: Optional[float],
+        progress_callback: Optional[Callable[[float, str], None]],
+        message: str,
+    ):
+        """
+        运行带 -progress pipe:1 的 FFmpeg 命令并实时回报进度
+
+        stderr 由守护线程持续读取到有界队列中（仅保留最后 200 行用于报错），
+        避免日志量过大时占用内存或写满管道导致 FFmpeg 阻塞。
+
+        Args:
+            cmd: 完整的 FFmpeg 命令
+            total_duration: 输入总时长（秒），未知时不计算百分比
+            progress_callback: 进度回调函数
+            message: 进度提示文本
+        """
+        stderr_tail: deque = deque(maxlen=200)
+        process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+        )
+
+        stderr_thread = threading.Thread(
+            target=lambda: stderr_tail.extend(process.stderr), daemon=True
+        )
+        stderr_thread.start()
+
+        last_percent = -1
+        for line in process.stdout:
+            key, _, value = line.strip().partition("=")
+            # out_time_ms 实际单位也是微秒（FFmpeg 历史遗留）
+            if key not in ("out_time_us", "out_time_ms") or not total_duration:
+                continue
+            try:
+                elapsed = int(value) / 1_000_000
+            except ValueError:
+                continue
+            percent = int(min(99, elapsed / total_duration * 100))
+            if progress_callback and percent > last_percent:
+                last_percent = percent
+                progress_callback(percent, message)
+
+        process.stdout.close()
+        returncode = process.wait()
+        stderr_thread.join()
+        process.stderr.close()
+
+        if returncode != 0:
+            error_msg = f"FFmpeg 错误: {''.join(stderr_tail).strip() or returncode}"
+            logger.error(error_msg)
+            raise RuntimeError(error_msg)
+
+    def open_audio_stream(
+        self,
+        video_path: str,
+        sample_rate: Optional[int] = None,
+        channels: Optional[int] = None,
+    ) -> FfmpegPipeline:
+        """
+        以管道方式从视频解码音频，返回可读的 16 位 WAV 流（不写中间文件）
+
+        Args:
+            video_path: 视频文件路径
+            sample_rate: 采样率，None 表示保持原始采样率
+            channels: 声道数，None 表示保持原始声道数
+
+        Returns:
+            已启动的 FfmpegPipeline，可直接 read() 或作为上下文管理器使用；
+            需要文件路径的调用方请继续使用 extract_audio
+        """
+        if not Path(video_path).exists():
+            raise FileNotFoundError(f"视频文件不存在: {video_path}")
+        if not self.ffmpeg_path:
+            raise RuntimeError("FFmpeg 未安装或未找到")
+
+        return FfmpegPipeline.audio_reader(
+            video_path,
+            ffmpeg_path=self.ffmpeg_path,
+            sample_rate=sample_rate,
+            channels=channels,
+        ).start()
+
+    def _load_duration_cache(self) -> "OrderedDict[str, float]":
+        """从临时目录加载持久化的时长缓存（文件中按最近使用顺序保存）"""
+        try:
+            with open(self._duration_cache_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return OrderedDict()
+        if not isinstance(entries, dict):
+            return OrderedDict()
+        cache = OrderedDict(entries)
+        while len(cache) > DURATION_CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+        return cache
+
+    def _save_duration_cache(self):
+        """原子写入时长缓存（调用方需持有锁）"""
+        tmp_path = self._duration_cache_path.with_suffix(".json.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._duration_cache, f)
+            os.replace(tmp_path, self._duration_cache_path)
+        except OSError as e:
+            logger.warning(f"保存时长缓存失败: {e}")
+        self._duration_unsaved = 0
+        self._duration_saved_at = time.monotonic()
+
+    def flush_duration_cache(self):
+        """将尚未落盘的时长缓存写入磁盘（进程退出时自动调用）"""
+        with self._duration_lock:
+            if self._duration_unsaved:
+                self._save_duration_cache()
+
+    def _cached_duration(self, media_path: str, reader: Callable[[str], float]) -> float:
+        """
+        按 (路径, 修改时间, 文件大小) 缓存媒体时长，文件变化后自动失效
+
+        Args:
+            media_path: 媒体文件路径
+            reader: 缓存未命中时实际读取时长的函数
+
+        Returns:
+            时长（秒）
+        """
+        try:
+            st = os.stat(media_path)
+        except OSError:
+            return reader(media_path)
+
+        key = f"{os.path.abspath(media_path)}|{st.st_mtime_ns}|{st.st_size}"
+        with self._duration_lock:
+            duration = self._duration_cache.get(key)
+            if duration is not None:
+                self._duration_cache.move_to_end(key)
+                return duration
+
+        duration = reader(media_path)
+        with self._duration_lock:
+            self._duration_cache[key] = duration
+            self._duration_cache.move_to_end(key)
+            # 超出上限时淘汰最久未使用的条目（含文件已变化的过期键）
+            while len(self._duration_cache) > DURATION_CACHE_MAX_ENTRIES:
+                self._duration_cache.popitem(last=False)
+            # 攒够一批或距上次写入足够久才落盘，其余在退出时写入
+            self._duration_unsaved += 1
+            if (
+                self._duration_unsaved >= DURATION_CACHE_SAVE_BATCH
+                or time.monotonic() - self._duration_saved_at >= DURATION_CACHE_SAVE_INTERVAL
+            ):
+                self._save_duration_cache()
+        return duration
+
     def get_audio_duration(self, audio_path: str) -> float:
         """
-        获取音频时长
+        获取音频时长（优先只读文件头，不解码音频数据）
 
         Args:
             audio_path: 音频文件路径
@@ -165,35 +525,72 @@ class AudioProcessor:
         Returns:
             时长（秒）
         """
+        return self._cached_duration(audio_path, self._read_audio_duration)
+
+    def _read_audio_duration(self, audio_path: str) -> float:
+        """读取音频时长（不经过缓存）"""
+        # 1. soundfile 读取 WAV/FLAC 等文件头
+        if SOUNDFILE_AVAILABLE:
+            try:
+                info = sf.info(audio_path)
+                duration = info.frames / info.samplerate
+                logger.debug("音频时长: %.2fs - %s", duration, audio_path)
+                return duration
+            except RuntimeError:
+                pass
+
+        # 2. ffprobe 读取容器元数据（mp3/mp4/mkv 等）
+        ffprobe_path = self._find_ffprobe()
+        if ffprobe_path:
+            try:
+                duration = self._probe_duration(ffprobe_path, audio_path)
+                logger.debug("音频时长: %.2fs - %s", duration, audio_path)
+                return duration
+            except Exception as e:
+                logger.warning(f"ffprobe 获取音频时长失败，将完整解码: {e}")
+
+        # 3. 备用方案：pydub 完整解码
         try:
             audio = AudioSegment.from_file(audio_path)
             duration = len(audio) / 1000.0  # 转换为秒
-            logger.debug(f"音频时长: {duration:.2f}s - {audio_path}")
+            logger.debug("音频时长: %.2fs - %s", duration, audio_path)
             return duration
         except Exception as e:
             logger.error(f"获取音频时长失败: {e}")
             raise
 
+    def _probe_duration(self, ffprobe_path: str, media_path: str) -> float:
+        """使用 ffprobe 读取媒体时长（秒）"""
+        cmd = [
+            ffprobe_path,
+            "-v",
+            "error",
+            "-show_entries",
+            "format=duration",
+            "-of",
+            "default=noprint_wrappers=1:nokey=1",
+            str(media_path),
+        ]
+
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        return float(result.stdout.strip())
+
     def _find_ffprobe(self) -> Optional[str]:
         """查找 ffprobe 可执行文件"""
-        # 1. 优先使用配置路径
-        if self.config.ffprobe_path and os.path.exists(self.config.ffprobe_path):
-            return self.config.ffprobe_path
-
-        # 2. 尝试与 ffmpeg 在同一目录
-        if self.ffmpeg_path and self.ffmpeg_path != "ffmpeg":
-            ffprobe_path = Path(self.ffmpeg_path).parent / "ffprobe.exe"
-            if ffprobe_path.exists():
-                return str(ffprobe_path)
+        return _discover_ffprobe(self.config.ffprobe_path, self.ffmpeg_path)
 
-        # 3. 尝试系统 PATH
+    def _probe_audio_codec(self, media_path: str) -> Tuple[Optional[str], Optional[str]]:
+        """获取音频编码与码率（结果按文件 mtime/size 缓存）"""
+        ffprobe_path = self._find_ffprobe()
+        if not ffprobe_path:
+            return None, None
         try:
-            subprocess.run(["ffprobe", "-version"], capture_output=True, timeout=2)
-            return "ffprobe"
-        except:
-            pass
-
-        return None
+            st = os.stat(media_path)
+        except OSError:
+            return None, None
+        return _probe_audio_stream(
+            ffprobe_path, os.path.abspath(media_path), st.st_mtime_ns, st.st_size
+        )
 
     def get_video_duration(self, video_path: str) -> float:
         """
@@ -205,26 +602,18 @@ class AudioProcessor:
         Returns:
             时长（秒）
         """
+        return self._cached_duration(video_path, self._read_video_duration)
+
+    def _read_video_duration(self, video_path: str) -> float:
+        """读取视频时长（不经过缓存）"""
         try:
             ffprobe_path = self._find_ffprobe()
             if not ffprobe_path:
                 raise RuntimeError("未找到 ffprobe")
 
             # 使用 ffprobe 获取时长
-            cmd = [
-                ffprobe_path,
-                "-v",
-                "error",
-                "-show_entries",
-                "format=duration",
-                "-of",
-                "default=noprint_wrappers=1:nokey=1",
-                video_path,
-            ]
-
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            duration = float(result.stdout.strip())
-            logger.debug(f"视频时长: {duration:.2f}s - {video_path}")
+            duration = self._probe_duration(ffprobe_path, video_path)
+            logger.debug("视频时长: %.2fs - %s", duration, video_path)
             return duration
         except Exception as e:
             logger.error(f"获取视频时长失败: {e}")
@@ -232,7 +621,7 @@ class AudioProcessor:
             try:
                 audio = AudioSegment.from_file(video_path)
                 duration = len(audio) / 1000.0
-                logger.debug(f"使用 pydub 获取视频时长: {duration:.2f}s - {video_path}")
+                logger.debug("使用 pydub 获取视频时长: %.2fs - %s", duration, video_path)
                 return duration
             except Exception as e2:
                 logger.error(f"备用方案也失败: {e2}")
@@ -244,9 +633,12 @@ class AudioProcessor:
         chunk_duration: float = 30.0,
         overlap: float = 1.0,
         progress_callback: Optional[Callable[[float, str], None]] = None,
-    ) -> list:
+    ) -> ChunkBatch:
         """
-        将音频分割成块（流式处理）
+        将音频分割成块
+
+        音频只解码一次为 int16 数组，各块均为该数组的视图（不复制采样数据）。
+        soundfile 不可用或无法读取该格式时通过 FFmpeg 管道解码，仍失败再回退到 pydub。
 
         Args:
             audio_path: 音频文件路径
@@ -255,80 +647,197 @@ class AudioProcessor:
             progress_callback: 进度回调函数
 
         Returns:
-            音频块列表 [(start_time, end_time, audio_segment)]
+            ChunkBatch，迭代时产出 (start_time, end_time, pcm_view)
         """
         logger.info(f"开始分割音频: {audio_path}, 块大小: {chunk_duration}s")
 
         try:
-            audio = AudioSegment.from_file(audio_path)
-            total_duration = len(audio) / 1000.0
+            samples = None
+            if SOUNDFILE_AVAILABLE:
+                try:
+                    samples, sample_rate = sf.read(audio_path, dtype="int16", always_2d=False)
+                except RuntimeError:
+                    samples = None
+
+            if samples is None and self.ffmpeg_path:
+                samples, sample_rate = self._decode_via_pipe(audio_path)
+
+            if samples is None:
+                # 直接在 pydub 的 raw_data 上建立数组视图，分块时不再逐块复制 AudioSegment
+                audio = AudioSegment.from_file(audio_path).set_sample_width(2)
+                samples = np.frombuffer(memoryview(audio.raw_data), dtype=np.int16)
+                if audio.channels > 1:
+                    samples = samples.reshape(-1, audio.channels)
+                sample_rate = audio.frame_rate
+
+            batch = self._split_samples(samples, sample_rate, chunk_duration, overlap)
 
-            chunks = []
-            chunk_ms = int(chunk_duration * 1000)
-            overlap_ms = int(overlap * 1000)
+            if progress_callback:
+                progress_callback(100, f"分割音频块 {len(batch)}...")
 
-            start = 0
-            chunk_idx = 0
+            logger.info(f"音频分割完成，共 {len(batch)} 块")
+            return batch
 
-            while start < len(audio):
-                end = min(start + chunk_ms, len(audio))
-                chunk = audio[start:end]
+        except Exception as e:
+            logger.error(f"分割音频失败: {e}")
+            raise
 
-                start_time = start / 1000.0
-                end_time = end / 1000.0
+    def _decode_via_pipe(self, audio_path: str) -> Tuple[Optional[np.ndarray], int]:
+        """
+        通过 FFmpeg 管道按原始采样率和声道数解码为 int16 数组（不经过临时文件）
 
-                chunks.append((start_time, end_time, chunk))
+        Returns:
+            (采样数组, 采样率)，解码失败时采样数组为 None
+        """
+        try:
+            with self.open_audio_stream(audio_path) as stream:
+                sample_rate, channels, pcm = read_wav_stream(stream)
+        except (RuntimeError, ValueError) as e:
+            logger.warning(f"FFmpeg 管道解码失败，回退到 pydub: {e}")
+            return None, 0
+
+        # 管道可能在半帧处截断，只保留完整帧
+        frame_bytes = 2 * channels
+        samples = np.frombuffer(pcm, dtype=np.int16, count=len(pcm) // frame_bytes * channels)
+        if channels > 1:
+            samples = samples.reshape(-1, channels)
+        return samples, sample_rate
+
+    def _split_samples(
+        self,
+        samples: np.ndarray,
+        sample_rate: int,
+        chunk_duration: float,
+        overlap: float,
+    ) -> ChunkBatch:
+        """
+        按固定时长计算所有分块边界（一次性向量化计算）
 
-                chunk_idx += 1
-                if progress_callback and chunk_idx % 10 == 0:
-                    progress = min(100, (end / len(audio)) * 100)
-                    progress_callback(progress, f"分割音频块 {chunk_idx}...")
+        Args:
+            samples: 采样数组
+            sample_rate: 采样率
+            chunk_duration: 每块时长（秒）
+            overlap: 重叠时长（秒）
 
-                # 移动到下一个位置（考虑重叠）
-                start = end - overlap_ms if end < len(audio) else end
+        Returns:
+            ChunkBatch
+        """
+        total = len(samples)
+        chunk_size = max(1, int(chunk_duration * sample_rate))
+        # 步长不能小于 1，否则重叠不小于块长时无法前进
+        step = max(1, chunk_size - int(overlap * sample_rate))
 
-            logger.info(f"音频分割完成，共 {len(chunks)} 块")
-            return chunks
+        if total == 0:
+            count = 0
+        elif total <= chunk_size:
+            count = 1
+        else:
+            # 最后一块的结束位置首次到达末尾即停止
+            count = -(-(total - chunk_size) // step) + 1
 
-        except Exception as e:
-            logger.error(f"分割音频失败: {e}")
-            raise
+        begins = np.arange(count, dtype=np.int64) * step
+        stops = np.minimum(begins + chunk_size, total)
+
+        return ChunkBatch(
+            starts=begins / sample_rate,
+            ends=stops / sample_rate,
+            pcm=samples,
+            sr=sample_rate,
+            offsets=np.stack([begins, stops], axis=1),
+        )
 
     def export_audio_segment(
         self,
-        audio_segment: AudioSegment,
+        audio_segment,
         output_path: str,
         format: str = "wav",
         sample_rate: int = 16000,
+        source_rate: Optional[int] = None,
     ) -> str:
         """
         导出音频片段
 
         Args:
-            audio_segment: 音频片段
+            audio_segment: 音频片段（AudioSegment 或 split_audio 返回的 NumPy 采样数组）
             output_path: 输出路径
             format: 格式
-            sample_rate: 采样率
+            sample_rate: 输出采样率
+            source_rate: NumPy 数组的采样率（必填，split_audio 的结果取 ChunkBatch.sr），
+                与 sample_rate 不同时先重采样
 
         Returns:
             输出路径
         """
         try:
-            audio_segment.export(
-                output_path, format=format, parameters=["-ar", str(sample_rate)]
-            )
-            logger.debug(f"音频片段导出完成: {output_path}")
+            if isinstance(audio_segment, AudioSegment):
+                if (
+                    SOUNDFILE_AVAILABLE
+                    and format == "wav"
+                    and audio_segment.frame_rate == sample_rate
+                    and audio_segment.channels == 1
+                    and audio_segment.sample_width == 2
+                ):
+                    # 已是 16-bit 单声道且采样率一致，直接写入 PCM，无需启动 FFmpeg
+                    samples = np.frombuffer(audio_segment.raw_data, dtype=np.int16)
+                    sf.write(output_path, samples, sample_rate, subtype="PCM_16")
+                else:
+                    audio_segment.export(
+                        output_path, format=format, parameters=["-ar", str(sample_rate)]
+                    )
+            else:
+                self._export_samples(audio_segment, output_path, format, sample_rate, source_rate)
+            logger.debug("音频片段导出完成: %s", output_path)
             return output_path
         except Exception as e:
             logger.error(f"导出音频片段失败: {e}")
             raise
 
+    def _export_samples(
+        self,
+        samples: np.ndarray,
+        output_path: str,
+        format: str,
+        sample_rate: int,
+        source_rate: Optional[int],
+    ):
+        """将 NumPy 采样数组写入文件（单声道 / 立体声，必要时重采样到 sample_rate）"""
+        if not SOUNDFILE_AVAILABLE:
+            raise RuntimeError("soundfile 不可用，无法导出 NumPy 采样数组")
+        if not source_rate:
+            raise ValueError("导出 NumPy 采样数组需要指定 source_rate")
+
+        sf_format = format.upper()
+        if sf_format not in sf.available_formats():
+            raise ValueError(f"soundfile 不支持写入该格式: {format}")
+
+        samples = np.asarray(samples)
+        channels = 1 if samples.ndim == 1 else samples.shape[1] if samples.ndim == 2 else 0
+        if channels not in (1, 2):
+            raise ValueError(f"不支持的采样数组形状: {samples.shape}")
+
+        if source_rate != sample_rate:
+            if samples.dtype != np.int16:
+                # 浮点采样按 [-1, 1] 量化为 16 位
+                samples = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+            resampled = AudioSegment(
+                data=np.ascontiguousarray(samples).tobytes(),
+                sample_width=2,
+                frame_rate=source_rate,
+                channels=channels,
+            ).set_frame_rate(sample_rate)
+            samples = np.frombuffer(resampled.raw_data, dtype=np.int16)
+            if channels > 1:
+                samples = samples.reshape(-1, channels)
+
+        sf.write(output_path, samples, sample_rate, format=sf_format)
+
     def extract_segment(
         self,
         audio_path: str,
         start_time: float,
         end_time: float,
         output_path: Optional[str] = None,
+        threads: int = 1,
     ) -> str:
         """
         提取音频片段 (优化版：直接使用 FFmpeg 提取，避免加载整个文件到内存)
@@ -338,6 +847,8 @@ class AudioProcessor:
             start_time: 开始时间（秒）
             end_time: 结束时间（秒）
             output_path: 输出路径（可选）
+            threads: FFmpeg 解码/滤镜线程数。短片段的工作量很小，多线程的初始化开销
+                反而占主导，且并行提取时多个进程会超额占用 CPU，默认为 1
 
         Returns:
             输出路径
@@ -352,13 +863,17 @@ class AudioProcessor:
         else:
             output_path = Path(output_path)
 
-        logger.debug(f"正在提取音频片段: {audio_path} [{start_time}s - {end_time}s]")
+        logger.debug("正在提取音频片段: %s [%ss - %ss]", audio_path, start_time, end_time)
 
         try:
             # 使用 FFmpeg 直接提取片段，这样更快且不占用内存
+            # -ss 放在 -i 之前为输入端快速定位；音频默认启用 accurate_seek（解码后丢弃多余采样），
+            # 仍能精确到采样点，因此不使用 -noaccurate_seek 以免字幕片段边界偏移
             duration = end_time - start_time
             cmd = [
                 self.ffmpeg_path,
+                "-filter_threads", str(threads),
+                "-threads", str(threads),
                 "-ss", str(start_time),
                 "-t", str(duration),
                 "-i", str(audio_path),
@@ -391,6 +906,117 @@ class AudioProcessor:
             logger.error(f"提取音频片段失败: {e}")
             raise
 
+    def _segment_output_paths(
+        self, segments: Sequence[Tuple[float, float]], output_dir: Optional[str]
+    ) -> List[str]:
+        """
+        生成批量提取的输出路径
+
+        未指定输出目录时在临时目录下为本次调用新建子目录，并发调用提取相同时间段时不会互相覆盖；
+        文件名带序号，同一次调用中的重复片段也各自输出。
+        """
+        if not segments:
+            return []
+        out_dir = Path(output_dir or tempfile.mkdtemp(prefix="segments_", dir=self.temp_dir))
+        return [
+            str(out_dir / f"segment_{i:05d}_{start:.3f}_{end:.3f}.wav")
+            for i, (start, end) in enumerate(segments)
+        ]
+
+    def extract_segments_batch(
+        self,
+        audio_path: str,
+        segments: Sequence[Tuple[float, float]],
+        output_dir: Optional[str] = None,
+        max_outputs_per_call: int = 100,
+    ) -> List[str]:
+        """
+        批量提取音频片段：一次 FFmpeg 调用输出多个 WAV，避免逐段启动进程和重复解封装
+
+        Args:
+            audio_path: 音频或视频文件路径
+            segments: 片段列表 [(start_time, end_time)]（秒）
+            output_dir: 输出目录（可选，默认在临时目录下为本次调用新建子目录）
+            max_outputs_per_call: 单次调用的最大输出数（避免命令行过长）
+
+        Returns:
+            与 segments 一一对应的输出路径列表
+        """
+        if not Path(audio_path).exists():
+            logger.error(f"批量提取片段失败：源文件不存在 -> {audio_path}")
+            raise FileNotFoundError(f"源文件不存在: {audio_path}")
+
+        output_paths = self._segment_output_paths(segments, output_dir)
+
+        for offset in range(0, len(segments), max_outputs_per_call):
+            group = segments[offset : offset + max_outputs_per_call]
+            group_paths = output_paths[offset : offset + max_outputs_per_call]
+
+            cmd = [self.ffmpeg_path, "-i", str(audio_path)]
+            for (start, end), out_path in zip(group, group_paths):
+                cmd += [
+                    "-ss", str(start),
+                    "-t", str(end - start),
+                    "-map", "0:a:0",
+                    "-acodec", "pcm_s16le",
+                    "-ar", "16000",
+                    "-ac", "1",
+                    "-y",
+                    out_path,
+                ]
+
+            try:
+                subprocess.run(cmd, check=True, capture_output=True, text=True)
+            except subprocess.CalledProcessError as e:
+                # 备用方案：逐段提取
+                logger.warning(f"FFmpeg 批量提取失败，回退到逐段提取: {e.stderr}")
+                for (start, end), out_path in zip(group, group_paths):
+                    self.extract_segment(audio_path, start, end, out_path)
+
+        logger.debug("批量提取音频片段完成: %d 段 - %s", len(segments), audio_path)
+        return output_paths
+
+    def extract_segments_parallel(
+        self,
+        audio_path: str,
+        segments: Sequence[Tuple[float, float]],
+        output_dir: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ) -> List[str]:
+        """
+        并行提取音频片段：同时运行多个单线程 FFmpeg 进程，重叠进程启动与 I/O 等待
+
+        Args:
+            audio_path: 音频或视频文件路径
+            segments: 片段列表 [(start_time, end_time)]（秒）
+            output_dir: 输出目录（可选，默认在临时目录下为本次调用新建子目录）
+            max_workers: 最大并发进程数（默认 CPU 核数）
+
+        Returns:
+            与 segments 一一对应的输出路径列表
+        """
+        if not Path(audio_path).exists():
+            logger.error(f"并行提取片段失败：源文件不存在 -> {audio_path}")
+            raise FileNotFoundError(f"源文件不存在: {audio_path}")
+
+        output_paths = self._segment_output_paths(segments, output_dir)
+        if not segments:
+            return output_paths
+
+        workers = max(1, min(max_workers or os.cpu_count() or 1, len(segments)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self.extract_segment, audio_path, start, end, out_path)
+                for (start, end), out_path in zip(segments, output_paths)
+            ]
+            for future in futures:
+                future.result()
+
+        logger.debug(
+            "并行提取音频片段完成: %d 段, 并发数 %d - %s", len(segments), workers, audio_path
+        )
+        return output_paths
+
     def adjust_audio_speed(
         self,
         input_path: str,
@@ -410,38 +1036,40 @@ class AudioProcessor:
         Returns:
             输出路径
         """
+        same_format = Path(input_path).suffix.lower() == Path(output_path).suffix.lower()
+
         if abs(speed_factor - 1.0) < 0.01:
-            # 速度几乎没变，直接复制或导出
+            # 速度几乎没变：同格式直接复制文件，否则仅转封装/转码一次
             if input_path != output_path:
-                audio = AudioSegment.from_file(input_path)
-                audio.export(output_path, format="mp3")
+                if same_format:
+                    shutil.copyfile(input_path, output_path)
+                else:
+                    audio = AudioSegment.from_file(input_path)
+                    audio.export(output_path, format="mp3")
             return output_path
 
-        logger.debug(f"正在调整音频速度: {speed_factor:.2f}x -> {input_path}")
+        logger.debug("正在调整音频速度: %.2fx -> %s", speed_factor, input_path)
 
         try:
-            # 构造 atempo 滤镜链
-            # ffmpeg 的 atempo 滤镜限制在 0.5 到 2.0 之间，超出范围需要串联
-            filters = []
-            temp_factor = speed_factor
-            
-            while temp_factor > 2.0:
-                filters.append("atempo=2.0")
-                temp_factor /= 2.0
-            while temp_factor < 0.5:
-                filters.append("atempo=0.5")
-                temp_factor /= 0.5
-            filters.append(f"atempo={temp_factor}")
-            
-            filter_str = ",".join(filters)
+            filter_str = _build_atempo(round(speed_factor, 4))
 
+            # atempo 滤镜可受益于少量并行，固定 2 线程避免与其他任务争抢 CPU
             cmd = [
                 self.ffmpeg_path,
+                "-threads", "2",
                 "-i", str(input_path),
                 "-filter:a", filter_str,
-                "-y",
-                str(output_path)
             ]
+
+            # 同格式输出时沿用输入的编码与码率，避免 PCM 被按扩展名默认编码器重新压缩
+            if same_format:
+                codec, bit_rate = self._probe_audio_codec(input_path)
+                if codec:
+                    cmd += ["-c:a", _AUDIO_ENCODERS.get(codec, codec)]
+                    if bit_rate and not codec.startswith("pcm_"):
+                        cmd += ["-b:a", bit_rate]
+
+            cmd += ["-y", str(output_path)]
             
             subprocess.run(cmd, check=True, capture_output=True, text=True)
             return str(output_path)
@@ -1,8 +1,11 @@
 """统一音频识别接口 - 仅支持API模式"""
 
-from typing import Optional, Callable, Dict
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Callable, Dict, List, Tuple
 
 from utils.logger import get_logger
+from utils.config import get_config
 from core.sensevoice_client import SenseVoiceClient
 
 logger = get_logger("audio_recognizer")
@@ -14,6 +17,7 @@ class AudioRecognizer:
     """
 
     def __init__(self):
+        self.config = get_config()
         self.api_client = SenseVoiceClient()
         logger.info("音频识别器初始化完成（API模式）")
 
@@ -37,6 +41,50 @@ class AudioRecognizer:
         logger.info(f"使用云端API转录: {audio_path}")
         return self.api_client.transcribe(audio_path, language, progress_callback)
 
+    def transcribe_batch(
+        self,
+        items: List[Tuple[str, str]],
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+    ) -> List[Dict]:
+        """
+        并发转录多个音频文件，结果顺序与输入一致
+
+        Args:
+            items: [(audio_path, language)] 列表
+            progress_callback: 进度回调函数，按已完成文件数报告
+
+        Returns:
+            转录结果列表，与 items 一一对应
+        """
+        if not items:
+            return []
+
+        max_workers = max(1, min(self.config.max_concurrent_tasks, len(items)))
+        logger.info(f"批量转录 {len(items)} 个音频，并发数: {max_workers}")
+
+        callback_lock = threading.Lock()
+        results: List[Optional[Dict]] = [None] * len(items)
+        completed = 0
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.api_client.transcribe, audio_path, language): idx
+                for idx, (audio_path, language) in enumerate(items)
+            }
+            for future in as_completed(futures):
+                idx = futures[future]
+                results[idx] = future.result()
+
+                if progress_callback:
+                    with callback_lock:
+                        completed += 1
+                        progress_callback(
+                            completed / len(items) * 100,
+                            f"已转录 {completed}/{len(items)}",
+                        )
+
+        return results
+
 
 # 单例模式
 _recognizer_instance: Optional[AudioRecognizer] = None
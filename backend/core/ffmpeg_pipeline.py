@@ -0,0 +1,201 @@
+"""FFmpeg 管道模块 - 通过 stdin/stdout 在进程间传递数据，避免中间文件落盘"""
+
+import logging
+import struct
+import subprocess
+import threading
+from collections import deque
+from typing import BinaryIO, List, Optional, Tuple
+
+from utils.logger import get_logger
+
+logger = get_logger("ffmpeg_pipeline")
+
+# Linux 下可调整管道容量（fcntl.F_SETPIPE_SZ）
+try:
+    import fcntl
+
+    F_SETPIPE_SZ = getattr(fcntl, "F_SETPIPE_SZ", 1031)
+except ImportError:
+    fcntl = None
+    F_SETPIPE_SZ = None
+
+
+class FfmpegPipeline:
+    """单个 FFmpeg 进程的管道封装，可作为只读文件对象使用"""
+
+    PIPE_BUFFER_SIZE = 1 << 20  # 1MB，减少读写系统调用次数
+    CLOSE_TIMEOUT = 5.0  # 提前关闭输出后等待 FFmpeg 退出的秒数
+
+    def __init__(self, args: List[str], ffmpeg_path: str = "ffmpeg", pipe_stdin: bool = False):
+        """
+        Args:
+            args: FFmpeg 参数（不含可执行文件路径），输出应写到 "-" / "pipe:1"
+            ffmpeg_path: FFmpeg 可执行文件路径
+            pipe_stdin: 是否通过 stdin 向 FFmpeg 输入数据（输入参数使用 "-i -"）
+        """
+        self.cmd = [ffmpeg_path, "-hide_banner", "-loglevel", "error", *args]
+        self.pipe_stdin = pipe_stdin
+        self.process: Optional[subprocess.Popen] = None
+        self._eof = False
+        self._stderr_tail: deque = deque(maxlen=200)
+        self._stderr_thread: Optional[threading.Thread] = None
+
+    def start(self) -> "FfmpegPipeline":
+        """启动 FFmpeg 进程，stderr 由守护线程持续读取，避免写满管道导致 FFmpeg 阻塞"""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("启动 FFmpeg 管道: %s", " ".join(self.cmd))
+        self.process = subprocess.Popen(
+            self.cmd,
+            stdin=subprocess.PIPE if self.pipe_stdin else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=self.PIPE_BUFFER_SIZE,
+        )
+        self._enlarge_pipe(self.process.stdout)
+        if self.pipe_stdin:
+            self._enlarge_pipe(self.process.stdin)
+
+        stderr = self.process.stderr
+        self._stderr_thread = threading.Thread(
+            target=lambda: self._stderr_tail.extend(stderr), daemon=True
+        )
+        self._stderr_thread.start()
+        return self
+
+    def _enlarge_pipe(self, stream):
+        """尽量将内核管道容量提升到 PIPE_BUFFER_SIZE（仅 Linux 支持）"""
+        if fcntl is None or stream is None:
+            return
+        try:
+            fcntl.fcntl(stream.fileno(), F_SETPIPE_SZ, self.PIPE_BUFFER_SIZE)
+        except OSError:
+            pass
+
+    @property
+    def stdin(self):
+        return self.process.stdin if self.process else None
+
+    @property
+    def stdout(self):
+        return self.process.stdout if self.process else None
+
+    def read(self, size: int = -1) -> bytes:
+        """从 FFmpeg 输出读取数据"""
+        if self.process is None:
+            self.start()
+        data = self.process.stdout.read(size)
+        if size is None or size < 0 or not data:
+            self._eof = True
+        return data
+
+    def readable(self) -> bool:
+        return True
+
+    def close(self):
+        """
+        关闭管道并等待 FFmpeg 退出
+
+        输出已读到 EOF 时返回码非 0 即报错；输出未读完就关闭属于调用方主动放弃输出，
+        FFmpeg 会因管道断开退出（超时未退出则强制终止），此时不报错。
+        """
+        if self.process is None:
+            return
+
+        process = self.process
+        self.process = None
+        if process.stdin:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+
+        process.stdout.close()
+        try:
+            process.wait(timeout=None if self._eof else self.CLOSE_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        if self._stderr_thread is not None:
+            self._stderr_thread.join()
+        process.stderr.close()
+
+        if process.returncode == 0:
+            return
+        if not self._eof:
+            logger.debug("FFmpeg 管道提前关闭，返回码: %s", process.returncode)
+            return
+        error_msg = b"".join(self._stderr_tail).decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"FFmpeg 错误: {error_msg or process.returncode}")
+
+    def __enter__(self) -> "FfmpegPipeline":
+        if self.process is None:
+            self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # 读到 EOF 后解析出错多半是 FFmpeg 本身失败，此时由 close() 抛出带 stderr 的错误
+        self.close()
+        return False
+
+    @classmethod
+    def audio_reader(
+        cls,
+        input_path: str,
+        ffmpeg_path: str = "ffmpeg",
+        sample_rate: Optional[int] = None,
+        channels: Optional[int] = None,
+    ) -> "FfmpegPipeline":
+        """构造从视频/音频文件解码为 16 位 WAV 流的管道，采样率 / 声道数为 None 时保持原样"""
+        args = ["-i", str(input_path), "-vn", "-map", "0:a:0"]
+        if sample_rate:
+            args += ["-ar", str(sample_rate)]
+        if channels:
+            args += ["-ac", str(channels)]
+        args += ["-c:a", "pcm_s16le", "-f", "wav", "-bitexact", "-"]
+        return cls(args, ffmpeg_path=ffmpeg_path)
+
+
+def read_wav_stream(stream: BinaryIO) -> Tuple[int, int, bytes]:
+    """
+    从不可回退的流中读取 16 位 PCM WAV
+
+    写入管道时 FFmpeg 无法回填 RIFF/data 的长度字段，因此忽略声明的长度，读取到流结束为止。
+
+    Args:
+        stream: 可读的二进制流（如 FfmpegPipeline）
+
+    Returns:
+        (采样率, 声道数, PCM 数据)
+    """
+
+    def read_exact(size: int) -> bytes:
+        # 管道可能分多次返回数据，读满 size 字节或到流结束为止
+        parts = []
+        remaining = size
+        while remaining > 0:
+            data = stream.read(remaining)
+            if not data:
+                raise ValueError("WAV 流提前结束")
+            parts.append(data)
+            remaining -= len(data)
+        return b"".join(parts)
+
+    riff, _, wave = struct.unpack("<4sI4s", read_exact(12))
+    if riff != b"RIFF" or wave != b"WAVE":
+        raise ValueError("不是 WAV 流")
+
+    sample_rate = channels = None
+    while True:
+        chunk_id, chunk_size = struct.unpack("<4sI", read_exact(8))
+        if chunk_id == b"data":
+            break
+        body = read_exact(chunk_size + (chunk_size & 1))
+        if chunk_id == b"fmt ":
+            fmt_tag, channels, sample_rate, _, _, bits = struct.unpack("<HHIIHH", body[:16])
+            if fmt_tag != 1 or bits != 16:
+                raise ValueError(f"不支持的 WAV 编码: tag={fmt_tag}, bits={bits}")
+
+    if sample_rate is None:
+        raise ValueError("WAV 流缺少 fmt 块")
+    return sample_rate, channels, stream.read()
@@ -0,0 +1,156 @@
+"""TTS 音频缓存模块 - 基于 SQLite 索引的 LRU 磁盘缓存"""
+
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+from utils.logger import get_logger
+from utils.config import get_config
+
+logger = get_logger("tts_cache")
+
+
+class TTSCache:
+    """TTS 音频 LRU 缓存，按 (音色, 模型, 文本) 复用已合成的音频文件"""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = 10 * 1024**3):
+        self.config = get_config()
+        self.cache_dir = Path(cache_dir) if cache_dir else Path(self.config.temp_dir) / "tts_cache"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.cache_dir / "index.db"), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, filename TEXT NOT NULL, "
+                "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_last_access ON entries(last_access)"
+            )
+            # 旧版索引没有 result 列，补上后旧条目的 result 为 NULL
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(entries)")}
+            if "result" not in columns:
+                self._conn.execute("ALTER TABLE entries ADD COLUMN result TEXT")
+        logger.info(f"TTS 缓存初始化完成: {self.cache_dir}")
+
+    @staticmethod
+    def make_key(voice_name: str, model: str, text: str, start: float, end: float) -> str:
+        """生成缓存键（TTS 客户端会收到片段的起止时间，时间不同的片段不共用音频）"""
+        return hashlib.sha256(
+            f"{voice_name}|{model}|{text}|{start}|{end}".encode("utf-8")
+        ).hexdigest()
+
+    def get(self, key: str, dest_dir: Optional[str] = None) -> Optional[str]:
+        """
+        查询缓存
+
+        Args:
+            key: 缓存键
+            dest_dir: 调用方的工作目录；指定时命中的音频在锁内硬链接（失败则复制）到该目录，
+                之后的 LRU 淘汰不会影响返回的文件
+
+        Returns:
+            音频路径（指定 dest_dir 时为其中的副本），未命中返回 None
+        """
+        entry = self.get_entry(key, dest_dir)
+        return entry[0] if entry else None
+
+    def get_entry(
+        self, key: str, dest_dir: Optional[str] = None
+    ) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        查询缓存，同时返回写入时记录的 TTS 客户端结果
+
+        Args:
+            key: 缓存键
+            dest_dir: 同 get
+
+        Returns:
+            (音频路径, 客户端结果 JSON)，未记录结果时后者为 None；未命中返回 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT filename, result FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            path = self.cache_dir / row[0]
+            with self._conn:
+                if not path.exists():
+                    self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    return None
+                self._conn.execute(
+                    "UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key)
+                )
+            if dest_dir is not None:
+                path = self._checkout(path, Path(dest_dir))
+            return str(path), row[1]
+
+    @staticmethod
+    def _checkout(path: Path, dest_dir: Path) -> Path:
+        """将缓存文件链接到 dest_dir，已存在时直接复用（调用方需持有锁）"""
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        dst = dest_dir / path.name
+        if dst.exists():
+            return dst
+        try:
+            os.link(path, dst)
+        except OSError:
+            shutil.copyfile(path, dst)
+        return dst
+
+    def put(self, key: str, audio_path: str, result: Optional[str] = None) -> str:
+        """
+        写入缓存（复制音频文件），超出容量时按最近最少使用淘汰
+
+        Args:
+            key: 缓存键
+            audio_path: 已合成的音频路径
+            result: TTS 客户端返回结果的 JSON，命中时据此还原结果形态
+
+        Returns:
+            缓存中的音频路径
+        """
+        src = Path(audio_path)
+        filename = f"{key}{src.suffix}"
+        dst = self.cache_dir / filename
+
+        with self._lock:
+            shutil.copyfile(src, dst)
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, filename, size, last_access, result) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, filename, dst.stat().st_size, time.time(), result),
+                )
+            self._evict()
+        return str(dst)
+
+    def _evict(self):
+        """淘汰最久未使用的条目直到总大小低于上限（调用方需持有锁）"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        removed = 0
+        rows = self._conn.execute(
+            "SELECT key, filename, size FROM entries ORDER BY last_access"
+        ).fetchall()
+        with self._conn:
+            for key, filename, size in rows:
+                if total <= self.max_bytes:
+                    break
+                (self.cache_dir / filename).unlink(missing_ok=True)
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+                removed += 1
+        logger.info(f"TTS 缓存淘汰了 {removed} 个条目")
@@ -0,0 +1,37 @@
+"""语言检测：逐字符路径与向量化路径的一致性测试"""
+
+import unittest
+
+from utils import lang_detect
+
+# 覆盖 ASCII、CJK 以及 lower() 会落入 a-z 的非 ASCII 字符（İ、开尔文符号 K）
+SAMPLES = [
+    "Hello, 世界！これはテストです。안녕하세요",
+    "İstanbul 的温度是 300 K（开尔文）",
+    "ĲÆßÐŁ ǅ ﬃ ΣΩ Привет мир",
+    "abcXYZ[\\]^_`{|}~@ 数字 0123456789",
+    "",
+]
+
+
+class ScriptCountsTest(unittest.TestCase):
+    def test_numpy_matches_scalar(self):
+        for text in SAMPLES:
+            with self.subTest(text=text):
+                self.assertEqual(
+                    lang_detect._script_counts_numpy(text),
+                    lang_detect._script_counts_scalar(text),
+                )
+
+    def test_long_text_matches_short_text(self):
+        # 超过阈值的文本走向量化路径，结果应与逐段相加一致
+        text = "İK ok 中文 カナ 한글 " * 8
+        self.assertGreaterEqual(len(text), lang_detect._VECTORIZE_MIN_LEN)
+        lang_detect.lru_cache_clear_all()
+        self.assertEqual(
+            lang_detect.script_counts(text), lang_detect._script_counts_scalar(text)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
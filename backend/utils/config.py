@@ -3,6 +3,8 @@
 import json
 import os
 import time
+import threading
+from functools import lru_cache
 from pathlib import Path
 from dataclasses import dataclass, asdict, field
 from typing import Optional, Dict, List, Any
@@ -12,6 +14,26 @@ from .logger import get_logger
 
 logger = get_logger("config")
 
+BASE_DIR = Path(__file__).parent.parent
+
+# 环境变量快照，由 Config.bootstrap 加载 .env 后填充
+_env: Dict[str, str] = {}
+
+
+@lru_cache(maxsize=1)
+def _load_env() -> Dict[str, str]:
+    """加载 .env 并返回环境变量快照（进程内只执行一次）"""
+    env_path = BASE_DIR / ".env"
+    if env_path.exists():
+        load_dotenv(env_path)
+    return dict(os.environ)
+
+
+@lru_cache(maxsize=None)
+def _ensure_dir(path: str):
+    """创建目录（同一路径只创建一次）"""
+    Path(path).mkdir(parents=True, exist_ok=True)
+
 
 @dataclass
 class Config:
@@ -117,33 +139,40 @@ class Config:
     theme: str = "light"
 
     def __post_init__(self):
-        """初始化后处理"""
-        # 加载环境变量
-        env_path = Path(__file__).parent.parent / ".env"
-        if env_path.exists():
-            load_dotenv(env_path)
-
+        """初始化后处理（无磁盘副作用，加载 .env 与创建目录见 bootstrap）"""
         # 从环境变量覆盖
-        if os.getenv("SILICONFLOW_API_KEY"):
-            self.api_key = os.getenv("SILICONFLOW_API_KEY")
-        if os.getenv("API_BASE_URL"):
-            self.api_base_url = os.getenv("API_BASE_URL")
+        if _env.get("SILICONFLOW_API_KEY"):
+            self.api_key = _env["SILICONFLOW_API_KEY"]
+        if _env.get("API_BASE_URL"):
+            self.api_base_url = _env["API_BASE_URL"]
 
         # 确保路径是绝对路径
-        base_dir = Path(__file__).parent.parent
-        self.temp_dir = str(base_dir / self.temp_dir)
-        self.output_dir = str(base_dir / self.output_dir)
+        self.temp_dir = str(BASE_DIR / self.temp_dir)
+        self.output_dir = str(BASE_DIR / self.output_dir)
 
         # 设置默认 FFmpeg 路径
-        ffmpeg_bin_dir = base_dir.parent / "ffmpeg" / "ffmpeg-master-latest-win64-gpl" / "bin"
+        ffmpeg_bin_dir = BASE_DIR.parent / "ffmpeg" / "ffmpeg-master-latest-win64-gpl" / "bin"
         if not self.ffmpeg_path:
             self.ffmpeg_path = str(ffmpeg_bin_dir / "ffmpeg.exe")
         if not self.ffprobe_path:
             self.ffprobe_path = str(ffmpeg_bin_dir / "ffprobe.exe")
 
-        # 创建目录
-        Path(self.temp_dir).mkdir(parents=True, exist_ok=True)
-        Path(self.output_dir).mkdir(parents=True, exist_ok=True)
+    @classmethod
+    def bootstrap(cls, config_path: Optional[str] = None) -> "Config":
+        """
+        加载 .env 与配置文件，并创建工作目录
+
+        Args:
+            config_path: 配置文件路径（可选）
+
+        Returns:
+            配置实例
+        """
+        _env.update(_load_env())
+        config = cls.load(config_path)
+        _ensure_dir(config.temp_dir)
+        _ensure_dir(config.output_dir)
+        return config
 
     def to_dict(self) -> dict:
         """转换为字典"""
@@ -152,7 +181,7 @@ class Config:
     def save(self, config_path: Optional[str] = None):
         """保存配置到文件"""
         if config_path is None:
-            config_path = Path(__file__).parent.parent / "config.json"
+            config_path = BASE_DIR / "config.json"
 
         try:
             with open(config_path, "w", encoding="utf-8") as f:
@@ -166,7 +195,7 @@ class Config:
     def load(cls, config_path: Optional[str] = None) -> "Config":
         """从文件加载配置"""
         if config_path is None:
-            config_path = Path(__file__).parent.parent / "config.json"
+            config_path = BASE_DIR / "config.json"
 
         config = cls()
 
@@ -242,18 +271,22 @@ class Config:
 
 # 全局配置实例
 _config_instance: Optional[Config] = None
+_config_lock = threading.Lock()
 
 
 def get_config() -> Config:
     """获取全局配置实例"""
     global _config_instance
     if _config_instance is None:
-        _config_instance = Config.load()
+        with _config_lock:
+            if _config_instance is None:
+                _config_instance = Config.bootstrap()
     return _config_instance
 
 
 def reload_config() -> Config:
     """重新加载配置"""
     global _config_instance
-    _config_instance = Config.load()
+    with _config_lock:
+        _config_instance = Config.bootstrap()
     return _config_instance
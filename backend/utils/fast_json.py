@@ -0,0 +1,62 @@
+"""JSON 序列化模块 - 优先使用 orjson，不可用时回退到标准库 json"""
+
+import json
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+from .logger import get_logger
+
+logger = get_logger("fast_json")
+
+# 尝试导入 orjson，如果失败则使用标准库
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logger.warning("orjson 不可用，将使用标准库 json")
+
+
+def _default(obj: Any) -> Any:
+    """orjson 不支持的类型交给 Flask 默认规则处理（日期、dataclass 等）"""
+    return DefaultJSONProvider.default(obj)
+
+
+def dumps(obj: Any, **kwargs) -> str:
+    """序列化为 JSON 字符串（忽略 indent/separators 等格式参数）"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    kwargs.setdefault("ensure_ascii", False)
+    kwargs.setdefault("default", _default)
+    return json.dumps(obj, **kwargs)
+
+
+def loads(s: Any, **kwargs) -> Any:
+    """反序列化 JSON 字符串或字节"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(s)
+    return json.loads(s, **kwargs)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON 提供器，jsonify / request.get_json 均走 orjson"""
+
+    def dumps(self, obj: Any, **kwargs) -> str:
+        return dumps(obj, **kwargs)
+
+    def loads(self, s: Any, **kwargs) -> Any:
+        return loads(s, **kwargs)
+
+
+class OrjsonAdapter:
+    """供 Flask-SocketIO 使用的 json 模块适配器（需提供 dumps / loads）"""
+
+    @staticmethod
+    def dumps(obj: Any, **kwargs) -> str:
+        return dumps(obj, **kwargs)
+
+    @staticmethod
+    def loads(s: Any, **kwargs) -> Any:
+        return loads(s, **kwargs)
@@ -1,7 +1,45 @@
-from typing import Dict, Tuple, List, Optional
+import re
+from array import array
+from functools import lru_cache
+from typing import Dict, Tuple, List, Optional, Sequence
+
+import numpy as np
+
+# 短文本直接逐字符统计，避免 NumPy 数组构造开销
+_VECTORIZE_MIN_LEN = 32
+
+# 纯 ASCII 文本中需删除的非字母字节，剩余长度即英文字母数
+_ASCII_NON_ALPHA = bytes(i for i in range(128) if not chr(i).isalpha())
+
+# 非 ASCII 但 ch.lower() 落在 a-z 之间的字符（İ -> "i̇"，开尔文符号 K -> "k"），
+# 逐字符路径会将其计为英文，向量化路径需同样计入
+_EN_EXTRA_CODES = (0x0130, 0x212A)
+
+# 连续的字母或数字（等价于 str.isalnum，匹配在 re 的 C 实现中完成）
+_ALNUM_RUN = re.compile(r"[^\W_]+")
+
+
+# 同一条字幕会在语言守卫、重试、偏差检测中反复判定，按文本缓存结果
+_CACHE_SIZE = 4096
 
 
 def script_counts(text: str) -> Dict[str, int]:
+    # 返回副本，避免调用方修改缓存中的字典
+    return dict(_script_counts(text))
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _script_counts(text: str) -> Dict[str, int]:
+    if text.isascii():
+        letters = len(text.encode("ascii").translate(None, _ASCII_NON_ALPHA))
+        return {"zh": 0, "ja": 0, "ko": 0, "en": letters}
+
+    if len(text) >= _VECTORIZE_MIN_LEN:
+        return _script_counts_numpy(text)
+    return _script_counts_scalar(text)
+
+
+def _script_counts_scalar(text: str) -> Dict[str, int]:
     counts = {"zh": 0, "ja": 0, "ko": 0, "en": 0}
     for ch in text:
         code = ord(ch)
@@ -16,26 +54,47 @@ def script_counts(text: str) -> Dict[str, int]:
     return counts
 
 
+def _script_counts_numpy(text: str) -> Dict[str, int]:
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    lower = codes | 0x20  # ASCII 大写字母转小写
+    en = (lower >= 0x61) & (lower <= 0x7A)
+    for code in _EN_EXTRA_CODES:
+        en |= codes == code
+    return {
+        "zh": int(np.count_nonzero((codes >= 0x4E00) & (codes <= 0x9FFF))),
+        "ja": int(np.count_nonzero((codes >= 0x3040) & (codes <= 0x30FF))),
+        "ko": int(np.count_nonzero((codes >= 0xAC00) & (codes <= 0xD7AF))),
+        "en": int(np.count_nonzero(en)),
+    }
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
 def detect_language(text: str) -> str:
-    counts = script_counts(text)
-    total = sum(counts.values())
-    if total == 0:
+    counts = _script_counts(text)
+
+    # 单次遍历求最大值与次大值（并列时保留先出现的语言）
+    first = second = 0
+    dominant = "unknown"
+    for lang, count in counts.items():
+        if count > first:
+            second = first
+            first = count
+            dominant = lang
+        elif count > second:
+            second = count
+
+    if first == 0:
         return "unknown"
-
     if counts["ja"] > 0:
         return "ja"
-
-    dominant = max(counts.items(), key=lambda x: x[1])[0]
-    second = sorted(counts.values(), reverse=True)[1]
-    if counts[dominant] == 0:
-        return "unknown"
-    if second / max(1, counts[dominant]) > 0.5:
+    if second / first > 0.5:
         return "mixed"
     return dominant
 
 
+@lru_cache(maxsize=_CACHE_SIZE)
 def mismatch_score(expected: str, text: str) -> float:
-    counts = script_counts(text)
+    counts = _script_counts(text)
     total = sum(counts.values())
     if total == 0:
         return 0.0
@@ -43,22 +102,38 @@ def mismatch_score(expected: str, text: str) -> float:
     return 1.0 - (expected_count / total)
 
 
-def normalize_with_map(text: str) -> Tuple[str, List[int]]:
-    normalized_chars: List[str] = []
-    index_map: List[int] = []
-    for i, ch in enumerate(text):
-        if ch.isalnum():
-            normalized_chars.append(ch.lower())
-            index_map.append(i)
-    return "".join(normalized_chars), index_map
+def lru_cache_clear_all():
+    """清空本模块的所有结果缓存"""
+    _script_counts.cache_clear()
+    detect_language.cache_clear()
+    mismatch_score.cache_clear()
+
+
+def normalize_with_map(text: str) -> Tuple[str, Sequence[int]]:
+    parts: List[str] = []
+    index_map = array("i")
+    for m in _ALNUM_RUN.finditer(text):
+        run = m.group().casefold()
+        start, end = m.span()
+        if len(run) == end - start:
+            index_map.extend(range(start, end))
+        else:
+            # casefold 改变了长度（如 ß -> ss），展开出的字符都映射回原字符位置
+            index_map.extend(start + i for i, ch in enumerate(m.group()) for _ in ch.casefold())
+        parts.append(run)
+    return "".join(parts), index_map
+
+
+def _normalize(text: str) -> str:
+    return "".join(_ALNUM_RUN.findall(text)).casefold()
 
 
 def extract_between_neighbors(
     combined_text: str, prev_text: str, next_text: str
 ) -> Optional[str]:
     combined_norm, combined_map = normalize_with_map(combined_text)
-    prev_norm, _ = normalize_with_map(prev_text)
-    next_norm, _ = normalize_with_map(next_text)
+    prev_norm = _normalize(prev_text)
+    next_norm = _normalize(next_text)
 
     if not prev_norm or not next_norm:
         return None
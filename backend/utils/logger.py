@@ -1,13 +1,119 @@
-"""日志工具模块"""
+"""
+日志工具模块
 
+所有记录器共用一个控制台处理器和一个文件处理器，日志经队列交给后台线程格式化与写入。
+
+调用约定：请使用 %-style 参数而不是 f-string，例如
+
+    logger.debug("音频时长: %.2fs - %s", duration, path)
+
+f-string 在调用时就会求值，即使该级别未启用也要付出格式化开销；
+%-style 参数只在日志真正输出时才格式化。也可以使用 log_lazy(logger, level, fmt, *args)，
+代价较高的消息可包装为 LazyMessage。
+"""
+
+import atexit
+import io
 import logging
+import os
+import queue
+import stat
 import sys
+import threading
+import time
 from pathlib import Path
-from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+from typing import Dict, Optional, Set
+
+# 日志格式中不使用线程/进程字段，关闭后每条记录少一次 current_thread()/getpid() 调用
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+
+
+def _ensure_utf8_stdout():
+    """控制台输出统一使用 utf-8（Windows 默认编码可能无法输出中文），进程内只执行一次"""
+    if getattr(sys.stdout, "_utf8_fixed", False):
+        return
+    try:
+        if (sys.stdout.encoding or "").lower() != "utf-8":
+            sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+    except AttributeError:
+        # 被替换为不支持 reconfigure 的流时才重新包装
+        try:
+            sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
+        except AttributeError:
+            return
+    except (ValueError, OSError):
+        return
+    try:
+        sys.stdout._utf8_fixed = True
+    except AttributeError:
+        pass
+
+
+_ensure_utf8_stdout()
+
+
+def _skip_find_caller(stack_info=False, stacklevel=1):
+    """替代 Logger.findCaller，跳过 sys._getframe 栈回溯（仅控制台输出时不需要文件名/行号）"""
+    return "(unknown file)", 0, "(unknown function)", None
+
+
+class FastFormatter(logging.Formatter):
+    """
+    固定格式的格式化器：时间 | 级别 | 名称 | [文件:行号 |] 消息
+
+    直接用 f-string 拼接，跳过 Formatter 的样式解析与 % 插值。
+    经 QueueHandler.prepare 处理后的记录消息已合并好（args 为 None），getMessage 不再插值。
+    """
+
+    def __init__(self, datefmt: Optional[str] = None, with_location: bool = False):
+        super().__init__(datefmt=datefmt)
+        self.with_location = with_location
+        self._ts_cache = (-1, "")  # (整数秒, 格式化后的时间)
+
+    def formatTime(self, record, datefmt=None):
+        # 时间格式精确到秒，同一秒内的记录复用上次的结果
+        sec = int(record.created)
+        cached_sec, cached = self._ts_cache
+        if sec == cached_sec:
+            return cached
+        formatted = time.strftime(datefmt or "%Y-%m-%d %H:%M:%S", self.converter(sec))
+        self._ts_cache = (sec, formatted)
+        return formatted
 
+    def _levelname(self, record) -> str:
+        return f"{record.levelname:<8}"
 
-class ColoredFormatter(logging.Formatter):
+    def _append_extras(self, record, s: str) -> str:
+        """追加异常堆栈与 stack_info（与 logging.Formatter.format 相同）"""
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            if s[-1:] != "\n":
+                s = s + "\n"
+            s = s + record.exc_text
+        if record.stack_info:
+            if s[-1:] != "\n":
+                s = s + "\n"
+            s = s + self.formatStack(record.stack_info)
+        return s
+
+    def format(self, record):
+        message = record.message = record.getMessage()
+        asctime = self.formatTime(record, self.datefmt)
+        level = self._levelname(record)
+        if self.with_location:
+            s = f"{asctime} | {level} | {record.name} | {record.filename}:{record.lineno} | {message}"
+        else:
+            s = f"{asctime} | {level} | {record.name} | {message}"
+        return self._append_extras(record, s)
+
+
+class ColoredFormatter(FastFormatter):
     """带颜色的日志格式化器"""
 
     COLORS = {
@@ -19,107 +125,232 @@ class ColoredFormatter(logging.Formatter):
     }
     RESET = "\033[0m"
 
-    def format(self, record):
-        log_color = self.COLORS.get(record.levelname, self.RESET)
-        record.levelname = f"{log_color}{record.levelname}{self.RESET}"
-        return super().format(record)
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # 预先生成补齐 8 位宽度后再着色的级别名称（先补齐再着色，转义符不影响对齐）
+        self._rendered = {
+            level: f"{color}{level:<8}{self.RESET}" for level, color in self.COLORS.items()
+        }
 
+    def _levelname(self, record) -> str:
+        # 不修改 record.levelname，同一条记录还要交给文件处理器
+        levelname = record.levelname
+        return self._rendered.get(levelname) or f"{levelname:<8}"
 
-class LoggerManager:
-    """日志管理器单例"""
 
-    _instance = None
-    _loggers = {}
+class CachedRotatingFileHandler(RotatingFileHandler):
+    """
+    按大小轮转的文件处理器
 
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
+    标准实现每次写日志都会 os.path.exists/isfile 检查文件类型，
+    这里只在打开文件时检查一次并缓存结果。
 
-    def __init__(self):
-        if self._initialized:
-            return
-        self._initialized = True
-        self.log_dir = Path(__file__).parent.parent / "logs"
-        self.log_dir.mkdir(exist_ok=True)
-        self.default_level = logging.INFO
-        self.max_bytes = 10 * 1024 * 1024  # 10MB
-        self.backup_count = 5
-
-    def setup_logger(
-        self, name: str, level: int = None, log_to_file: bool = True
-    ) -> logging.Logger:
-        """设置并获取日志记录器"""
-        if name in self._loggers:
-            return self._loggers[name]
-
-        logger = logging.getLogger(name)
-
-        # 避免重复添加处理器
-        if logger.handlers:
-            return logger
-
-        level = level or self.default_level
-        logger.setLevel(level)
-        logger.propagate = False
+    日志先写入 64KB 的用户态缓冲区，仅 ERROR 及以上级别立即刷新，
+    其余由后台线程每 0.5 秒刷新一次，避免每条日志都触发一次系统调用。
+    """
 
-        # 控制台处理器（带颜色）
-        # 在 Windows 上，显式设置编码为 utf-8
-        try:
-            import io
-            if sys.stdout.encoding.lower() != 'utf-8':
-                sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-        except:
-            pass
-
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(level)
-        console_format = ColoredFormatter(
-            "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
+    BUFFER_SIZE = 64 * 1024
+    FLUSH_INTERVAL = 0.5  # 后台刷新间隔（秒）
+
+    def __init__(self, *args, **kwargs):
+        self._closed_event = threading.Event()
+        super().__init__(*args, **kwargs)
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="log-flusher", daemon=True
         )
-        console_handler.setFormatter(console_format)
-        logger.addHandler(console_handler)
-
-        # 文件处理器（无颜色）
-        if log_to_file:
-            log_file = self.log_dir / f"{name}_{datetime.now().strftime('%Y%m%d')}.log"
-            file_handler = RotatingFileHandler(
-                log_file,
-                maxBytes=self.max_bytes,
-                backupCount=self.backup_count,
-                encoding="utf-8",
-            )
-            file_handler.setLevel(level)
-            file_format = logging.Formatter(
-                "%(asctime)s | %(levelname)-8s | %(name)s | %(filename)s:%(lineno)d | %(message)s",
-                datefmt="%Y-%m-%d %H:%M:%S",
-            )
-            file_handler.setFormatter(file_format)
-            logger.addHandler(file_handler)
-
-        self._loggers[name] = logger
-        return logger
+        self._flusher.start()
+
+    def _open(self):
+        stream = open(
+            self.baseFilename,
+            self.mode,
+            buffering=self.BUFFER_SIZE,
+            encoding=self.encoding,
+            errors=self.errors,
+        )
+        # 打开时 stat 一次，之后按写入量累加文件大小，轮转判断不再触发系统调用
+        st = os.fstat(stream.fileno())
+        self._is_regular_file = stat.S_ISREG(st.st_mode)
+        self._current_size = st.st_size
+        return stream
+
+    def _encoded_size(self, msg: str) -> int:
+        """消息写入文件后的字节数（纯 ASCII 时无需编码）"""
+        if msg.isascii():
+            return len(msg)
+        return len(msg.encode(self.encoding or "utf-8", self.errors or "strict"))
+
+    def _would_exceed(self, size: int) -> bool:
+        # 只轮转普通文件（与标准库 bpo-45401 的行为一致）
+        if self.maxBytes <= 0 or not self._is_regular_file:
+            return False
+        return self._current_size + size >= self.maxBytes
+
+    def shouldRollover(self, record):
+        if self.stream is None:
+            self.stream = self._open()
+        return self._would_exceed(self._encoded_size("%s\n" % self.format(record)))
+
+    def doRollover(self):
+        self._current_size = 0
+        super().doRollover()
 
-    def get_logger(self, name: str) -> logging.Logger:
-        """获取已配置的日志记录器"""
-        if name not in self._loggers:
-            return self.setup_logger(name)
-        return self._loggers[name]
+    def emit(self, record):
+        try:
+            msg = self.format(record) + self.terminator
+            size = self._encoded_size(msg)
+            if self.stream is None:
+                self.stream = self._open()
+            if self._would_exceed(size):
+                self.doRollover()
+            self.stream.write(msg)
+            self._current_size += size
+            # 只有 ERROR 及以上立即落盘，其余由后台线程定时刷新
+            if record.levelno >= logging.ERROR:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def _flush_loop(self):
+        """后台定时刷新缓冲区"""
+        while not self._closed_event.wait(self.FLUSH_INTERVAL):
+            self.flush()
+
+    def close(self):
+        self._closed_event.set()
+        super().close()
+
+
+class LazyMessage:
+    """
+    延迟求值的日志消息：仅在记录真正输出、logging 调用 str(msg) 时才生成文本
+
+        logger.debug(LazyMessage(lambda: f"片段详情: {expensive_repr(segments)}"))
+        logger.debug(LazyMessage(expensive_repr, segments))
+
+    未启用的级别在 isEnabledFor 处即返回，producer 不会被调用；
+    由于不经过包装方法，调用方文件名/行号的定位与普通日志调用一致。
+    """
+
+    __slots__ = ("producer", "args")
+
+    def __init__(self, producer, *args):
+        self.producer = producer
+        self.args = args
+
+    def __str__(self) -> str:
+        return str(self.producer(*self.args))
 
 
-# 全局日志管理器实例
-_logger_manager = LoggerManager()
+# 日志配置
+LOG_DIR = Path(__file__).parent.parent / "logs"
+LOG_DIR.mkdir(exist_ok=True)
+_LOG_DIR_STR = str(LOG_DIR) + os.sep  # 预先转换为字符串，拼接日志文件名时不再经过 Path
+DEFAULT_LEVEL = logging.INFO
+MAX_BYTES = 10 * 1024 * 1024  # 10MB
+BACKUP_COUNT = 5
+
+# 已配置的日志记录器
+_LOGGERS: Dict[str, logging.Logger] = {}
+
+# 所有记录器共享同一个控制台处理器和文件处理器（首次 setup_logger 时创建），
+# 级别由各记录器自身控制，共享处理器不按级别过滤
+_console_handler: Optional[logging.Handler] = None
+_file_handler: Optional[logging.Handler] = None
+_CONSOLE_ONLY: Set[str] = set()  # log_to_file=False 的记录器名称
+_shared_lock = threading.Lock()
+
+# 调用线程只把日志放入队列，格式化与写文件由后台监听线程完成
+_log_queue = queue.Queue(-1)
+_queue_handler = QueueHandler(_log_queue)
+_listener: Optional[QueueListener] = None
+
+
+def _init_shared_handlers():
+    """创建共享处理器并启动后台监听线程"""
+    global _console_handler, _file_handler, _listener
+    with _shared_lock:
+        if _listener is not None:
+            return
+
+        # 控制台处理器（带颜色）
+        _console_handler = logging.StreamHandler(sys.stdout)
+        _console_handler.setFormatter(ColoredFormatter(datefmt="%Y-%m-%d %H:%M:%S"))
+
+        # 文件处理器（无颜色），所有记录器写入同一个以启动日期命名的文件（按大小轮转，不按天切换）
+        _file_handler = CachedRotatingFileHandler(
+            f"{_LOG_DIR_STR}app_{time.strftime('%Y%m%d')}.log",
+            maxBytes=MAX_BYTES,
+            backupCount=BACKUP_COUNT,
+            encoding="utf-8",
+        )
+        _file_handler.setFormatter(
+            FastFormatter(datefmt="%Y-%m-%d %H:%M:%S", with_location=True)
+        )
+        _file_handler.addFilter(lambda record: record.name not in _CONSOLE_ONLY)
+
+        _listener = QueueListener(
+            _log_queue, _console_handler, _file_handler, respect_handler_level=True
+        )
+        _listener.start()
+        atexit.register(_listener.stop)
 
 
 def setup_logger(
     name: str, level: int = None, log_to_file: bool = True
 ) -> logging.Logger:
-    """设置日志记录器"""
-    return _logger_manager.setup_logger(name, level, log_to_file)
+    """设置并获取日志记录器"""
+    cached = _LOGGERS.get(name)
+    if cached is not None:
+        return cached
+
+    level = level or DEFAULT_LEVEL
+    logger = logging.getLogger(name)
+
+    # 已挂载共享处理器时不再重复添加；带有其他处理器（如 pytest caplog）的记录器仍需挂载
+    if any(h is _queue_handler for h in logger.handlers):
+        _LOGGERS[name] = logger
+        return logger
+
+    # setLevel 会清空所有记录器的 isEnabledFor 缓存，级别未变化时不调用
+    if logger.level != level:
+        logger.setLevel(level)
+    if logger.propagate:
+        logger.propagate = False
+
+    # 控制台格式不含 %(filename)s/%(lineno)d，不写文件时无需定位调用方
+    if not log_to_file:
+        logger.findCaller = _skip_find_caller
+        _CONSOLE_ONLY.add(name)
+
+    if _listener is None:
+        _init_shared_handlers()
+    logger.addHandler(_queue_handler)
+
+    _LOGGERS[name] = logger
+    return logger
 
 
 def get_logger(name: str) -> logging.Logger:
     """获取日志记录器"""
-    return _logger_manager.get_logger(name)
+    logger = _LOGGERS.get(name)
+    return logger if logger is not None else setup_logger(name)
+
+
+def log_lazy(logger: logging.Logger, level: int, fmt: str, *args):
+    """以 %-style 参数记录日志，仅在该级别启用时才格式化消息"""
+    logger.log(level, fmt, *args, stacklevel=2)
+
+
+def debug_if(logger: logging.Logger, producer, *args):
+    """
+    仅在 DEBUG 级别启用时才生成并记录调试消息
+
+    Args:
+        logger: 日志记录器
+        producer: 消息字符串，或返回消息字符串的可调用对象（以 *args 调用）
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(producer(*args) if callable(producer) else producer, stacklevel=2)
@@ -4,6 +4,40 @@ import { useStore } from '../store';
 
 const WS_URL = import.meta.env.VITE_WS_URL || 'http://localhost:5000';
 
+// 二进制进度帧码表，需与后端 app.py 中的 PROGRESS_STATUS_CODES / PROGRESS_TEXT_CODES 保持一致
+const PROGRESS_STATUSES = ['pending', 'processing', 'paused', 'completed', 'failed', 'cancelled'];
+const PROGRESS_TEXTS = [
+  '正在提取音频...',
+  '正在检测语音段落...',
+  '正在识别语音...',
+  '正在生成字幕...',
+  '正在翻译字幕...',
+  '正在合成配音...',
+  '正在合成视频...',
+  '处理完成',
+  '翻译完成',
+  '配音合成完成',
+  '等待处理',
+  '等待重试',
+  '等待配音',
+];
+
+// 解析二进制进度帧: 任务 UUID(16B) + 进度(float32 LE) + 状态码(u8) + 状态文本码(u8)
+function decodeProgressFrame(buffer: ArrayBuffer) {
+  const view = new DataView(buffer);
+  const hex = Array.from(new Uint8Array(buffer, 0, 16), (b) => b.toString(16).padStart(2, '0')).join('');
+  const taskId = `${hex.slice(0, 8)}-${hex.slice(8, 12)}-${hex.slice(12, 16)}-${hex.slice(16, 20)}-${hex.slice(20)}`;
+  const statusText = PROGRESS_TEXTS[view.getUint8(21)] ?? '';
+  return {
+    taskId,
+    progress: view.getFloat32(16, true),
+    status: PROGRESS_STATUSES[view.getUint8(20)],
+    statusText,
+    detail: statusText,
+    timestamp: Date.now(),
+  };
+}
+
 class WebSocketService {
   private socket: Socket | null = null;
   private reconnectAttempts = 0;
@@ -72,6 +106,13 @@ class WebSocketService {
       this.emit('progress', update);
     });
 
+    // 任务进度更新（二进制帧）
+    this.socket.on('task_progress_bin', (buffer: ArrayBuffer) => {
+      const update = decodeProgressFrame(buffer) as unknown as ProgressUpdate;
+      this.handleProgressUpdate(update);
+      this.emit('progress', update);
+    });
+
     // 翻译进度更新
     this.socket.on('translation_progress', (data: any) => {
       console.log('Translation progress:', data);